@@ -20,6 +20,12 @@ from .file import File
 from .clazz import Class
 from .function import DummyFunction, Function, FunctionDeclaration
 from .statement import Statement, SimpleStatement, BlockStatement
-from .identifier import Identifier
+from .identifier import Identifier, IdentifierIndex
+from .taint import TaintAnalysis
 from .joern import JoernConfig
+from .cache import AnalysisCache
+from .callgraph import CallGraph
+from .resolver import NameResolver, ResolvedCall
+from .symbols import Symbol, SymbolIndex
+from .lsp import LSPBatch, LSPOpenFiles, LSPReadiness, LSPResponseCache
 from .cpg import Cpg, CpgNode, CpgEdge, SourceLocation
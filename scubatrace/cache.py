@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from functools import cached_property
+from importlib import metadata
+from typing import TYPE_CHECKING, Any
+
+import zstandard as zstd
+
+from .clazz import Class
+from .field import Field
+from .function import Function
+from .identifier import Identifier
+from .parser import Parser
+from .slots import cached_value
+from .statement import BlockStatement, SimpleStatement, Statement
+
+if TYPE_CHECKING:
+    from .file import File
+    from .project import Project
+
+CACHE_FORMAT_VERSION = 1
+"""The version of the on-disk entry layout. Bump it when the layout changes."""
+
+
+def _distribution_version(name: str) -> str:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class AnalysisCache:
+    """
+    A persistent on-disk cache of per-file analysis results.
+
+    Each file entry is keyed by the hash of the file content, the ScubaTrace version and
+    the tree-sitter grammar of the project language, so entries of changed files are never reused.
+
+    The entry of a file records its statement tree, the identifiers and CFG edges of its statements,
+    its symbols indexed by :class:`SymbolIndex`, and the LSP resolutions issued by :attr:`Function.callees`,
+    :attr:`Function.callers`, :attr:`Identifier.references`, :attr:`Identifier.definitions`,
+    :attr:`File.imports` and the hover type information of C identifiers.
+    As LSP resolutions depend on other files, they are only reused while the whole project is unchanged.
+    """
+
+    path: str
+    """The directory where cache entries are stored."""
+
+    project: Project
+    """The project whose analysis results are cached."""
+
+    def __init__(self, path: str, project: Project):
+        self.path = path
+        self.project = project
+        os.makedirs(path, exist_ok=True)
+        tslanguage = project.parser.language
+        self._salt = json.dumps(
+            [
+                CACHE_FORMAT_VERSION,
+                _distribution_version("scubatrace"),
+                _distribution_version("tree_sitter"),
+                project.language.__name__,
+                tslanguage.version,
+                tslanguage.node_kind_count,
+                tslanguage.field_count,
+                tslanguage.parse_state_count,
+            ]
+        )
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._stored: dict[str, bytes] = {}
+        self._lock = threading.RLock()
+
+    def digest(self, file: File) -> str:
+        """
+        The cache key of the file for its current content.
+
+        Args:
+            file (File): The file to compute the key for.
+
+        Returns:
+            str: The hex digest of the file content hash and the cache versions.
+        """
+        return hashlib.sha256(
+            (self._salt + file.content_hash).encode()
+        ).hexdigest()
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """
+        A fingerprint of the contents of all project files.
+
+        LSP resolutions are tagged with it, since their results depend on the whole project.
+        """
+        sha = hashlib.sha256(self._salt.encode())
+        for relpath, file in sorted(self.project.files.items()):
+            sha.update(f"{relpath}\0{file.content_hash}\0".encode())
+        return sha.hexdigest()
+
+    def _entry_path(self, digest: str) -> str:
+        return os.path.join(self.path, digest[:2], digest + ".json.zst")
+
+    def _entry(self, file: File) -> dict[str, Any]:
+        digest = self.digest(file)
+        entry = self._entries.get(digest)
+        if entry is not None:
+            return entry
+        try:
+            with open(self._entry_path(digest), "rb") as f:
+                data = zstd.ZstdDecompressor().decompress(f.read())
+            entry = json.loads(data)
+            self._stored[digest] = data
+        except (OSError, ValueError, zstd.ZstdError):
+            entry = {}
+        self._entries[digest] = entry
+        return entry
+
+    def get_resolved(self, file: File, kind: str, key: str) -> Any | None:
+        """
+        Looks up an LSP resolution recorded for the file.
+
+        Args:
+            file (File): The file the resolution was issued from.
+            kind (str): The kind of resolution, such as ``"references"`` or ``"callees"``.
+            key (str): The key of the resolution within the file, such as a position.
+
+        Returns:
+            Any | None: The recorded resolution, or None if there is no valid one.
+        """
+        with self._lock:
+            resolved = self._entry(file).get("resolved")
+            if resolved is None or resolved.get("fingerprint") != self.fingerprint:
+                return None
+            return resolved.get(kind, {}).get(key)
+
+    def put_resolved(self, file: File, kind: str, key: str, value: Any):
+        """
+        Records an LSP resolution for the file.
+
+        Args:
+            file (File): The file the resolution was issued from.
+            kind (str): The kind of resolution, such as ``"references"`` or ``"callees"``.
+            key (str): The key of the resolution within the file, such as a position.
+            value (Any): The JSON-serializable resolution.
+        """
+        with self._lock:
+            entry = self._entry(file)
+            resolved: dict[str, Any] | None = entry.get("resolved")
+            if resolved is None or resolved.get("fingerprint") != self.fingerprint:
+                resolved = entry["resolved"] = {"fingerprint": self.fingerprint}
+            resolved.setdefault(kind, {})[key] = value
+
+    def get_symbols(self, file: File) -> list[list[Any]] | None:
+        """
+        Looks up the symbol records of the file, as indexed by :class:`SymbolIndex`.
+
+        Args:
+            file (File): The file to look up the symbols for.
+
+        Returns:
+            list[list[Any]] | None: The recorded symbols, or None if the file was not indexed.
+        """
+        with self._lock:
+            return self._entry(file).get("symbols")
+
+    def put_symbols(self, file: File, records: list[list[Any]]):
+        """
+        Records the symbols of the file.
+
+        Args:
+            file (File): The indexed file.
+            records (list[list[Any]]): The JSON-serializable symbol records of the file.
+        """
+        with self._lock:
+            self._entry(file)["symbols"] = records
+
+    def load_statements(self, file: File) -> list[Statement] | None:
+        """
+        Restores the statement tree of the file, with the identifiers and CFG edges recorded for it.
+
+        Args:
+            file (File): The file to restore the statements for.
+
+        Returns:
+            list[Statement] | None: The top-level statements of the file, or None if no valid entry exists.
+        """
+        entry = self._entry(file)
+        records = entry.get("statements")
+        if records is None:
+            return None
+        root = file.node
+        stats: list[Any] = []
+        top_stats: list[Any] = []
+        for start_byte, end_byte, type, kind, parent_index, expanded in records:
+            node = Parser.find_node(root, start_byte, end_byte, type)
+            if node is None:
+                return None
+            parent = file if parent_index < 0 else stats[parent_index]
+            if kind == "class":
+                stat = Class.create(node, parent)
+            elif kind == "field":
+                assert isinstance(parent, Class)
+                stat = Field.create(node, parent)
+            elif kind == "function":
+                stat = Function.create(node, parent)
+            elif kind == "block":
+                stat = BlockStatement.create(node, parent)
+            else:
+                stat = SimpleStatement.create(node, parent)
+            stats.append(stat)
+            if parent_index < 0:
+                top_stats.append(stat)
+            else:
+                cached_value(parent, "statements").append(stat)
+            if expanded:
+                assert isinstance(stat, BlockStatement)
+                stat.statements = []
+
+        # consumed by the control flow graph containing the statement once it is built
+        for index, post_indexes in entry.get("cfg", []):
+            stats[index]._post_controls = [stats[i] for i in post_indexes]
+
+        # children are recorded after their parents, so restore them first
+        for index, spans in reversed(entry.get("identifiers", [])):
+            stat = stats[index]
+            identifiers = []
+            for start_byte, end_byte, type in spans:
+                node = Parser.find_node(root, start_byte, end_byte, type)
+                if node is not None:
+                    identifiers.append(Identifier.create(node, stat))
+            for child in cached_value(stat, "statements", []):
+                if isinstance(child, Statement):
+                    identifiers.extend(child.identifiers)
+            stat.identifiers = sorted(
+                identifiers, key=lambda x: (x.start_line, x.start_column)
+            )
+        return top_stats
+
+    @staticmethod
+    def _known_post_controls(stat: Any) -> list[Statement] | None:
+        post_controls = getattr(stat, "_post_controls", None)
+        if post_controls is not None or isinstance(stat, Field):
+            return post_controls
+        if "control_flow_graph" not in stat._control_flow_parent.__dict__:
+            return None
+        return stat.post_controls
+
+    @staticmethod
+    def _dump_statements(file: File) -> dict[str, Any]:
+        records = []
+        cfg = []
+        identifiers = []
+        indexes: dict[int, int] = {}
+        stack: list[tuple[Any, int]] = [
+            (stat, -1) for stat in reversed(file.statements)
+        ]
+        ordered = []
+        while stack:
+            stat, parent_index = stack.pop()
+            index = len(records)
+            indexes[id(stat)] = index
+            ordered.append(stat)
+            if isinstance(stat, Field):
+                kind = "field"
+            elif isinstance(stat, Function):
+                kind = "function"
+            elif isinstance(stat, Class):
+                kind = "class"
+            elif isinstance(stat, BlockStatement):
+                kind = "block"
+            else:
+                kind = "simple"
+            # fields have no statements of their own
+            children = (
+                None if isinstance(stat, Field) else cached_value(stat, "statements")
+            )
+            node = stat.node
+            records.append(
+                [
+                    node.start_byte,
+                    node.end_byte,
+                    node.type,
+                    kind,
+                    parent_index,
+                    children is not None,
+                ]
+            )
+            if children is not None:
+                stack.extend((child, index) for child in reversed(children))
+
+        for index, stat in enumerate(ordered):
+            post_controls = AnalysisCache._known_post_controls(stat)
+            if post_controls is not None and all(
+                id(post) in indexes for post in post_controls
+            ):
+                cfg.append([index, [indexes[id(post)] for post in post_controls]])
+            stat_identifiers = cached_value(stat, "identifiers")
+            if stat_identifiers is not None:
+                identifiers.append(
+                    [
+                        index,
+                        [
+                            [i.node.start_byte, i.node.end_byte, i.node.type]
+                            for i in stat_identifiers
+                            if i.statement is stat
+                        ],
+                    ]
+                )
+        return {"statements": records, "cfg": cfg, "identifiers": identifiers}
+
+    def save(self):
+        """
+        Writes the analysis results of the project to the cache directory.
+
+        Only entries whose content changed since they were loaded are written.
+        """
+        for file in self.project.files.values():
+            if "statements" not in file.__dict__:
+                continue
+            self._entry(file).update(self._dump_statements(file))
+
+        compressor = zstd.ZstdCompressor()
+        for digest, entry in self._entries.items():
+            data = json.dumps(entry).encode()
+            if len(entry) == 0 or self._stored.get(digest) == data:
+                continue
+            entry_path = self._entry_path(digest)
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(compressor.compress(data))
+            os.replace(tmp_path, entry_path)
+            self._stored[digest] = data
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from array import array
+from typing import TYPE_CHECKING
+
+import networkx as nx
+
+from .dataflow import Adjacency
+
+if TYPE_CHECKING:
+    from .function import DummyFunction, Function, FunctionDeclaration
+    from .statement import Statement
+
+    Callee = Function | FunctionDeclaration | DummyFunction
+
+
+class CallGraph:
+    """
+    A compact call graph, with functions numbered by integer IDs and calls in CSR arrays.
+
+    Every call site is an edge, so a caller calling a callee twice has two edges to it.
+    The call site lines and columns of the edges are kept in arrays parallel to :attr:`calls`.
+    """
+
+    nodes: list[Callee]
+    """The functions, function declarations and external dummy functions of the graph, by ID."""
+
+    calls: Adjacency
+    """The callee IDs of each function, one per call site."""
+
+    callers: Adjacency
+    """The caller IDs of each function, one per calling function."""
+
+    lines: array[int]
+    """The line of the call site of each edge of :attr:`calls`."""
+
+    columns: array[int]
+    """The column of the call site of each edge of :attr:`calls`."""
+
+    def __init__(self, callees: dict[Callee, dict[Callee, list[Statement]]]):
+        """
+        Packs the callees of functions into a call graph.
+
+        Args:
+            callees (dict[Callee, dict[Callee, list[Statement]]]): The callees and call sites of each caller,
+                like :attr:`Function.callees`. Callers are numbered first, in the given order.
+        """
+        self.nodes = list(callees)
+        self._ids: dict[Callee, int] = {node: i for i, node in enumerate(self.nodes)}
+        offsets = array("i", [0])
+        targets = array("i")
+        self.lines = array("i")
+        self.columns = array("i")
+        for caller in list(self.nodes):
+            for callee, call_sites in callees[caller].items():
+                callee_id = self._ids.get(callee)
+                if callee_id is None:
+                    callee_id = self._ids[callee] = len(self.nodes)
+                    self.nodes.append(callee)
+                for call_site in call_sites:
+                    targets.append(callee_id)
+                    self.lines.append(call_site.start_line)
+                    self.columns.append(call_site.start_column)
+            offsets.append(len(targets))
+        offsets.extend([len(targets)] * (len(self.nodes) + 1 - len(offsets)))
+        self.calls = Adjacency(offsets, targets)
+        self.callers = Adjacency.from_lists(
+            [sorted(set(ids)) for ids in self.calls.reversed()]
+        )
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, node: Callee) -> bool:
+        return node in self._ids
+
+    def id(self, node: Callee) -> int:
+        """
+        The ID of a function in the graph.
+
+        Args:
+            node (Callee): A function, function declaration or dummy function of the graph.
+
+        Returns:
+            int: The ID of the function.
+
+        Raises:
+            KeyError: If the function is not in the graph.
+        """
+        return self._ids[node]
+
+    def callees_of(self, node: Callee) -> list[Callee]:
+        """
+        The distinct functions called by a function, in call site order.
+        """
+        callees = dict.fromkeys(self.calls[self.id(node)])
+        return [self.nodes[i] for i in callees]
+
+    def callers_of(self, node: Callee) -> list[Callee]:
+        """
+        The functions calling a function.
+        """
+        return [self.nodes[i] for i in self.callers[self.id(node)]]
+
+    def to_networkx(self) -> nx.MultiDiGraph:
+        """
+        Converts the call graph to a networkx graph, in the format of :attr:`Project.callgraph`.
+
+        Returns:
+            nx.MultiDiGraph: A graph with the functions as nodes and an edge per call site,
+                with its ``line`` and ``column``.
+        """
+        cg = nx.MultiDiGraph()
+        for node in self.nodes:
+            cg.add_node(node, label=node.dot_text)
+        offsets, targets = self.calls.offsets, self.calls.targets
+        for caller_id, caller in enumerate(self.nodes):
+            for edge in range(offsets[caller_id], offsets[caller_id + 1]):
+                cg.add_edge(
+                    caller,
+                    self.nodes[targets[edge]],
+                    line=self.lines[edge],
+                    column=self.columns[edge],
+                )
+        return cg
@@ -1,15 +1,30 @@
 import re
-from functools import cached_property
 
 from ..identifier import Identifier
+from ..slots import slot_cached_property
 
 
 class CIdentifier(Identifier):
-    @cached_property
+    __slots__ = ()
+
+    @slot_cached_property
     def type_info(self) -> str:
+        cache = self.file.project.analysis_cache
+        key = f"{self.start_line}:{self.start_column}"
+        if cache is not None:
+            type_info = cache.get_resolved(self.file, "type_info", key)
+            if type_info is not None:
+                return type_info
+        type_info = self._hover_type_info()
+        if cache is not None:
+            cache.put_resolved(self.file, "type_info", key, type_info)
+        return type_info
+
+    def _hover_type_info(self) -> str:
         type_info = ""
-        hover = self.lsp.request_hover(
-            self.file.relpath, self.start_line - 1, self.start_column - 1
+        batch = self.file.lsp_batch
+        [hover] = batch.gather(
+            [batch.hover(self.file.relpath, self.start_line - 1, self.start_column - 1)]
         )
         if hover is None:
             return type_info
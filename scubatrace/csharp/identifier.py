@@ -1,4 +1,5 @@
 from ..identifier import Identifier
 
 
-class CSharpIdentifier(Identifier): ...
+class CSharpIdentifier(Identifier):
+    __slots__ = ()
@@ -0,0 +1,985 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections import defaultdict, deque
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+from .statement import BlockStatement, Statement
+
+if TYPE_CHECKING:
+    from .file import File
+    from .function import Function
+    from .identifier import Identifier
+
+
+class Adjacency:
+    """
+    The adjacency lists of a graph in compressed sparse row (CSR) form.
+
+    The neighbors of node ``i`` are ``targets[offsets[i]:offsets[i + 1]]``.
+    """
+
+    __slots__ = ("offsets", "targets")
+
+    offsets: array[int]
+    """The start of the neighbors of each node in :attr:`targets`, followed by their total count."""
+
+    targets: array[int]
+    """The neighbors of all nodes, concatenated in node order."""
+
+    def __init__(self, offsets: array[int], targets: array[int]):
+        self.offsets = offsets
+        self.targets = targets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, node: int) -> array[int]:
+        return self.targets[self.offsets[node] : self.offsets[node + 1]]
+
+    def __iter__(self) -> Iterator[array[int]]:
+        for node in range(len(self)):
+            yield self[node]
+
+    @classmethod
+    def from_lists(cls, lists: list[list[int]]) -> Adjacency:
+        """
+        Packs the adjacency lists of a graph.
+
+        Args:
+            lists (list[list[int]]): The neighbors of each node.
+
+        Returns:
+            Adjacency: The packed adjacency.
+        """
+        offsets = array("i", [0])
+        targets = array("i")
+        for neighbors in lists:
+            targets.extend(neighbors)
+            offsets.append(len(targets))
+        return cls(offsets, targets)
+
+    def reversed(self) -> Adjacency:
+        """
+        The adjacency of the reversed graph, whose neighbors are in node order as well.
+        """
+        n = len(self)
+        offsets = array("i", bytes(4 * (n + 1)))
+        for target in self.targets:
+            offsets[target + 1] += 1
+        for node in range(n):
+            offsets[node + 1] += offsets[node]
+        targets = array("i", bytes(4 * len(self.targets)))
+        fill = offsets[:-1]
+        for node in range(n):
+            for target in self[node]:
+                targets[fill[target]] = node
+                fill[target] += 1
+        return Adjacency(offsets, targets)
+
+
+class ControlFlowGraph:
+    """
+    A compact control flow graph, with statements numbered in preorder and edges in CSR arrays.
+
+    The graph of a function starts with the function itself as the entry, whose only successor
+    is its first statement, and covers all the statements nested in it.
+    The graph of a file covers the statements outside functions, with functions as single nodes.
+    :attr:`Statement.pre_controls` and :attr:`Statement.post_controls` are views of these graphs.
+    """
+
+    parent: Function | File
+    """The function or file of the graph."""
+
+    statements: list[Statement]
+    """The statements of the graph in preorder."""
+
+    succs: Adjacency
+    """The successor indexes of each statement."""
+
+    preds: Adjacency
+    """The predecessor indexes of each statement."""
+
+    def __init__(self, parent: Function | File):
+        from .function import Function
+
+        self.parent = parent
+        if isinstance(parent, Function):
+            self.statements = [parent]
+        else:
+            self.statements = []
+        stack = list(reversed(parent.statements))
+        while stack:
+            stat = stack.pop()
+            if not isinstance(stat, Statement):
+                continue
+            self.statements.append(stat)
+            if isinstance(stat, BlockStatement) and (
+                isinstance(parent, Function) or not isinstance(stat, Function)
+            ):
+                stack.extend(reversed(stat.statements))
+        self.reindex()
+
+        index = {stat: i for i, stat in enumerate(self.statements)}
+        offsets = array("i", [0])
+        targets = array("i")
+        for i, stat in enumerate(self.statements):
+            if i == 0 and isinstance(parent, Function):
+                first = parent.first_statement
+                posts = [first] if first is not None else []
+            else:
+                posts = getattr(stat, "_post_controls", None)
+                if posts is None:
+                    posts = stat._build_post_controls()
+                else:
+                    del stat._post_controls
+            start = len(targets)
+            for post in posts:
+                j = index.get(post)
+                if j is not None and j not in targets[start:]:
+                    targets.append(j)
+            offsets.append(len(targets))
+        self.succs = Adjacency(offsets, targets)
+        self.preds = self.succs.reversed()
+
+    def reindex(self):
+        """
+        Refreshes the positions the statements are looked up by, after they were shifted by an edit.
+        """
+        self._start_bytes = array(
+            "q", (stat.node.start_byte for stat in self.statements)
+        )
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def __contains__(self, stat: Statement) -> bool:
+        try:
+            self.index(stat)
+        except ValueError:
+            return False
+        return True
+
+    def index(self, stat: Statement) -> int:
+        """
+        The index of a statement in the graph, found by binary search on its start byte.
+
+        Args:
+            stat (Statement): The statement to look up.
+
+        Returns:
+            int: The index of the statement.
+
+        Raises:
+            ValueError: If the statement is not in the graph.
+        """
+        start_byte = stat.node.start_byte
+        i = bisect_left(self._start_bytes, start_byte)
+        while i < len(self._start_bytes) and self._start_bytes[i] == start_byte:
+            if self.statements[i] == stat:
+                return i
+            i += 1
+        raise ValueError(f"{stat.signature} is not in the control flow graph")
+
+    def post_controls(self, stat: Statement) -> list[Statement]:
+        """
+        The statements executed right after a statement of the graph.
+        """
+        return [self.statements[j] for j in self.succs[self.index(stat)]]
+
+    def pre_controls(self, stat: Statement) -> list[Statement]:
+        """
+        The statements executed right before a statement of the graph.
+        """
+        return [self.statements[j] for j in self.preds[self.index(stat)]]
+
+
+class ReachingDefinitions:
+    """
+    Reaching definitions of a function, computed in one worklist fixpoint over its CFG.
+
+    A definition is a statement that assigns a variable, that is a statement with a left-value variable
+    of that name; assigning the same name again kills it. The function itself defines its parameters.
+    Definitions are numbered and the sets reaching each statement are kept as bitsets in Python integers,
+    from which the def-use chains of all variables in the function are derived.
+    """
+
+    function: Function
+    """The function whose definitions are computed."""
+
+    graph: ControlFlowGraph
+    """The control flow graph of the function."""
+
+    def __init__(self, function: Function):
+        self.function = function
+        self.graph = function.control_flow_graph
+        n = len(self.graph)
+
+        # a definition is a (statement, name) pair; its identifiers are the left values of that name
+        self._defs: list[list[Identifier]] = []
+        self._def_stats: list[int] = []
+        self._name_defs: dict[str, int] = defaultdict(int)
+        self._stat_defs: list[dict[str, int]] = [{} for _ in range(n)]
+        self._stat_uses: list[dict[str, list[Identifier]]] = [{} for _ in range(n)]
+        parameters = set(function.parameters)
+        for i, stat in enumerate(self.graph.statements):
+            if isinstance(stat, BlockStatement):
+                variables = stat.block_variables
+            else:
+                variables = stat.variables
+            defs = self._stat_defs[i]
+            uses = self._stat_uses[i]
+            for var in variables:
+                name = var.text
+                if not var.is_left_value and not (i == 0 and var in parameters):
+                    uses.setdefault(name, []).append(var)
+                    continue
+                if name not in defs:
+                    defs[name] = len(self._defs)
+                    self._defs.append([])
+                    self._def_stats.append(i)
+                    self._name_defs[name] |= 1 << defs[name]
+                self._defs[defs[name]].append(var)
+
+        gen = [0] * n
+        kill = [0] * n
+        for i, defs in enumerate(self._stat_defs):
+            for name, d in defs.items():
+                gen[i] |= 1 << d
+                kill[i] |= self._name_defs[name]
+        self._in = self._solve(gen, kill)
+        self._post: dict[int, list[Identifier]] | None = None
+
+    def _solve(self, gen: list[int], kill: list[int]) -> list[int]:
+        n = len(self.graph)
+        ins = [0] * n
+        outs = gen[:]
+        worklist = deque(range(n))
+        queued = [True] * n
+        while worklist:
+            i = worklist.popleft()
+            queued[i] = False
+            reaching = 0
+            for p in self.graph.preds[i]:
+                reaching |= outs[p]
+            ins[i] = reaching
+            out = gen[i] | (reaching & ~kill[i])
+            if out == outs[i]:
+                continue
+            outs[i] = out
+            for s in self.graph.succs[i]:
+                if not queued[s]:
+                    queued[s] = True
+                    worklist.append(s)
+        return ins
+
+    def __contains__(self, stat: Statement) -> bool:
+        return stat in self.graph
+
+    def _reaching(self, index: int, name: str) -> list[int]:
+        """
+        The definitions of a name reaching a statement, excluding the ones of the statement itself.
+        """
+        bits = self._in[index] & self._name_defs.get(name, 0)
+        own = self._stat_defs[index].get(name)
+        if own is not None:
+            bits &= ~(1 << own)
+        defs = []
+        while bits:
+            low = bits & -bits
+            defs.append(low.bit_length() - 1)
+            bits ^= low
+        return defs
+
+    def definitions(self, identifier: Identifier) -> list[Identifier]:
+        """
+        The left values whose definitions reach the use of an identifier.
+
+        Args:
+            identifier (Identifier): A right-value identifier of a statement in the function.
+
+        Returns:
+            list[Identifier]: The reaching left values, sorted by position.
+        """
+        index = self.graph.index(identifier.statement)
+        dependents = []
+        for d in self._reaching(index, identifier.text):
+            dependents.extend(self._defs[d])
+        return sorted(dependents, key=lambda x: (x.start_line, x.start_column))
+
+    def uses(self, identifier: Identifier) -> list[Identifier]:
+        """
+        The right values reached by the definition of an identifier.
+
+        Args:
+            identifier (Identifier): A left-value identifier of a statement in the function.
+
+        Returns:
+            list[Identifier]: The reached right values, sorted by position.
+        """
+        if self._post is None:
+            self._post = defaultdict(list)
+            for i, uses in enumerate(self._stat_uses):
+                for name, vars in uses.items():
+                    for d in self._reaching(i, name):
+                        self._post[d].extend(vars)
+        index = self.graph.index(identifier.statement)
+        d = self._stat_defs[index].get(identifier.text)
+        if d is None:
+            return []
+        return sorted(
+            self._post.get(d, []), key=lambda x: (x.start_line, x.start_column)
+        )
+
+
+def _reverse_postorder(succs: Adjacency | list[list[int]], entry: int) -> list[int]:
+    order = []
+    visited = [False] * len(succs)
+    visited[entry] = True
+    stack = [(entry, iter(succs[entry]))]
+    while stack:
+        node, nexts = stack[-1]
+        for next in nexts:
+            if not visited[next]:
+                visited[next] = True
+                stack.append((next, iter(succs[next])))
+                break
+        else:
+            stack.pop()
+            order.append(node)
+    order.reverse()
+    return order
+
+
+def _immediate_dominators(
+    succs: Adjacency | list[list[int]], preds: Adjacency | list[list[int]], entry: int
+) -> list[int]:
+    """
+    Immediate dominators by the iterative algorithm of Cooper, Harvey and Kennedy.
+
+    The entry is its own immediate dominator; nodes unreachable from it have -1.
+    """
+    order = _reverse_postorder(succs, entry)
+    rank = [-1] * len(succs)
+    for r, node in enumerate(order):
+        rank[node] = r
+    idom = [-1] * len(succs)
+    idom[entry] = entry
+    changed = True
+    while changed:
+        changed = False
+        for node in order[1:]:
+            new = -1
+            for pred in preds[node]:
+                if idom[pred] == -1:
+                    continue
+                if new == -1:
+                    new = pred
+                    continue
+                a, b = pred, new
+                while a != b:
+                    while rank[a] > rank[b]:
+                        a = idom[a]
+                    while rank[b] > rank[a]:
+                        b = idom[b]
+                new = a
+            if idom[node] != new:
+                idom[node] = new
+                changed = True
+    return idom
+
+
+class DominatorTree:
+    """
+    The dominator tree of a function, or its post-dominator tree, over its control flow graph.
+
+    Immediate dominators are computed with the algorithm of Cooper, Harvey and Kennedy, which
+    converges in a few passes over the reverse postorder of the structured control flow of source code.
+    Post-dominators are the dominators of the reversed graph, rooted at a virtual exit that follows
+    the exit statements and the function entry. Loops whose successors all lie in their body, as when
+    they end the function, leave to the virtual exit when their condition fails. Statements that still
+    never reach an exit, such as infinite loops, are connected to the virtual exit as well.
+    """
+
+    function: Function
+    """The function of the tree."""
+
+    post: bool
+    """Whether this is the post-dominator tree."""
+
+    def __init__(self, function: Function, post: bool = False):
+        self.function = function
+        self.post = post
+        self.graph = function.control_flow_graph
+        n = len(self.graph)
+        if not post:
+            self._root = 0
+            self._idom = _immediate_dominators(self.graph.succs, self.graph.preds, 0)
+        else:
+            self._root = n
+            succs = [list(preds) for preds in self.graph.preds] + [[0]]
+            preds = [list(succs) for succs in self.graph.succs] + [[]]
+            preds[0].append(n)
+            loop_types = function.language.LOOP_STATEMENTS
+            for i, stat in enumerate(self.graph.statements):
+                if len(self.graph.succs[i]) == 0 or (
+                    stat.node_type in loop_types and self._stays_in_loop(i)
+                ):
+                    succs[n].append(i)
+                    preds[i].append(n)
+            # connect the last statement of each region that cannot reach the exit
+            visited = [False] * (n + 1)
+            visited[n] = True
+            stack = [n]
+            for root in range(n, -1, -1):
+                if not visited[root]:
+                    succs[n].append(root)
+                    preds[root].append(n)
+                    visited[root] = True
+                    stack.append(root)
+                while stack:
+                    node = stack.pop()
+                    for next in succs[node]:
+                        if not visited[next]:
+                            visited[next] = True
+                            stack.append(next)
+            self._idom = _immediate_dominators(succs, preds, n)
+
+        self._children: list[list[int]] = [[] for _ in range(len(self._idom))]
+        for node, idom in enumerate(self._idom):
+            if idom != -1 and node != self._root:
+                self._children[idom].append(node)
+        # preorder intervals of the tree answer dominance queries in constant time
+        self._enter = [-1] * len(self._idom)
+        self._exit = [-1] * len(self._idom)
+        clock = 0
+        stack = [(self._root, False)]
+        while stack:
+            node, done = stack.pop()
+            if done:
+                self._exit[node] = clock
+                continue
+            self._enter[node] = clock
+            clock += 1
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(self._children[node]))
+
+    def _stays_in_loop(self, loop: int) -> bool:
+        # a loop that ends the function has no successor for its false condition in the graph
+        node = self.graph.statements[loop].node
+        for succ in self.graph.succs[loop]:
+            start_byte = self.graph.statements[succ].node.start_byte
+            if not node.start_byte < start_byte < node.end_byte:
+                return False
+        return True
+
+    def __contains__(self, stat: Statement) -> bool:
+        return stat in self.graph and self._idom[self.graph.index(stat)] != -1
+
+    def _statement(self, index: int) -> Statement | None:
+        return self.graph.statements[index] if index < len(self.graph) else None
+
+    def immediate_dominator(self, stat: Statement) -> Statement | None:
+        """
+        The immediate dominator, or post-dominator, of a statement.
+
+        Args:
+            stat (Statement): A statement of the function.
+
+        Returns:
+            Statement | None: The immediate dominator, or None for the root of the tree,
+                for statements only post-dominated by the exit, and for unreachable statements.
+        """
+        index = self.graph.index(stat)
+        idom = self._idom[index]
+        if idom == -1 or index == self._root:
+            return None
+        return self._statement(idom)
+
+    def children(self, stat: Statement) -> list[Statement]:
+        """
+        The statements immediately dominated, or post-dominated, by a statement.
+
+        Args:
+            stat (Statement): A statement of the function.
+
+        Returns:
+            list[Statement]: The children of the statement in the tree, in preorder.
+        """
+        return [
+            self.graph.statements[i] for i in self._children[self.graph.index(stat)]
+        ]
+
+    def dominates(self, a: Statement, b: Statement) -> bool:
+        """
+        Checks if a statement dominates, or post-dominates, another one.
+
+        Every statement dominates itself.
+
+        Args:
+            a (Statement): The dominating statement.
+            b (Statement): The dominated statement.
+
+        Returns:
+            bool: True if every path from the entry to ``b`` goes through ``a``,
+                or every path from ``b`` to an exit for the post-dominator tree.
+        """
+        i = self.graph.index(a)
+        j = self.graph.index(b)
+        if self._enter[i] == -1 or self._enter[j] == -1:
+            return False
+        return self._enter[i] <= self._enter[j] and self._exit[j] <= self._exit[i]
+
+
+class ControlDependenceGraph:
+    """
+    The control dependence graph of a function, derived from its post-dominator tree.
+
+    A statement is control dependent on a branch when it post-dominates a successor of the branch
+    but not the branch itself (Ferrante, Ottenstein and Warren). For every CFG edge, the statements
+    on the post-dominator tree path from the successor up to the immediate post-dominator of the branch
+    are control dependent on it. Statements that run whenever the function runs depend on the function itself.
+    Loop headers, which a branch in their body reaches again through the back edge, are not recorded as
+    dependent on that branch, so that the dependences follow the nesting of the code.
+    """
+
+    function: Function
+    """The function of the graph."""
+
+    def __init__(self, function: Function):
+        self.function = function
+        self.graph = function.control_flow_graph
+        tree = function.post_dominator_tree
+        n = len(self.graph)
+        self._dependents: list[list[int]] = [[] for _ in range(n)]
+        self._controllers: list[list[int]] = [[] for _ in range(n)]
+        nodes = [stat.node for stat in self.graph.statements]
+        for branch, succs in enumerate(self.graph.succs):
+            stop = tree._idom[branch]
+            node = nodes[branch]
+            for runner in succs:
+                while runner != stop and runner < n and runner != -1:
+                    # leave out the dependences carried back to an enclosing loop
+                    enclosing = nodes[runner]
+                    if not (
+                        enclosing.start_byte <= node.start_byte
+                        and node.end_byte <= enclosing.end_byte
+                    ):
+                        self._dependents[branch].append(runner)
+                        self._controllers[runner].append(branch)
+                    runner = tree._idom[runner]
+        for indexes in self._dependents + self._controllers:
+            indexes.sort()
+
+    def __contains__(self, stat: Statement) -> bool:
+        return stat in self.graph
+
+    def dependents(self, stat: Statement) -> list[Statement]:
+        """
+        The statements that are control dependent on a statement.
+
+        Args:
+            stat (Statement): A statement of the function.
+
+        Returns:
+            list[Statement]: The dependent statements, in source order.
+        """
+        return [
+            self.graph.statements[i] for i in self._dependents[self.graph.index(stat)]
+        ]
+
+    def controllers(self, stat: Statement) -> list[Statement]:
+        """
+        The statements that a statement is control dependent on.
+
+        Args:
+            stat (Statement): A statement of the function.
+
+        Returns:
+            list[Statement]: The controlling statements, in source order.
+        """
+        return [
+            self.graph.statements[i] for i in self._controllers[self.graph.index(stat)]
+        ]
+
+
+class ProgramDependenceGraph:
+    """
+    The program dependence graph of a function, for slicing it by many criteria.
+
+    The control flow, control dependence and data dependence edges of the statements of the function
+    are materialized once in CSR arrays, in both directions, so that each slice is a breadth-first search
+    over integers. Slices are confined to the statements of the function.
+    """
+
+    function: Function
+    """The function of the graph."""
+
+    def __init__(self, function: Function):
+        self.function = function
+        self.graph = function.control_flow_graph
+        cdg = function.control_dependence_graph
+        data: list[list[int]] = []
+        for stat in self.graph.statements:
+            dependencies = set()
+            for stats in stat.pre_data_dependents.values():
+                for dependency in stats:
+                    if dependency in self.graph:
+                        dependencies.add(self.graph.index(dependency))
+            data.append(sorted(dependencies))
+        pre_data = Adjacency.from_lists(data)
+        self._edges: dict[str, tuple[Adjacency, Adjacency]] = {
+            "control": (self.graph.preds, self.graph.succs),
+            "data_dependent": (pre_data, pre_data.reversed()),
+            "control_dependent": (
+                Adjacency.from_lists(cdg._controllers),
+                Adjacency.from_lists(cdg._dependents),
+            ),
+        }
+
+    def __contains__(self, stat: Statement) -> bool:
+        return stat in self.graph
+
+    @staticmethod
+    def _reach(
+        adjacencies: list[Adjacency], sources: list[int], depth: int = -1
+    ) -> set[int]:
+        reached = set(sources)
+        frontier = list(reached)
+        while frontier and depth != 0:
+            nexts = []
+            for node in frontier:
+                for adjacency in adjacencies:
+                    for target in adjacency[node]:
+                        if target not in reached:
+                            reached.add(target)
+                            nexts.append(target)
+            frontier = nexts
+            depth -= 1
+        return reached
+
+    def _dependence_closure(self, sources: list[int], backward: bool) -> set[int]:
+        """
+        The statements transitively data or control dependent on the sources, or the other way around.
+        """
+        direction = 0 if backward else 1
+        adjacencies = [
+            self._edges["data_dependent"][direction],
+            self._edges["control_dependent"][direction],
+        ]
+        return self._reach(adjacencies, sources)
+
+    def slice(
+        self,
+        statements: list[Statement],
+        *,
+        control_depth: int = 1,
+        data_dependent_depth: int = 1,
+        control_dependent_depth: int = 1,
+    ) -> list[Statement]:
+        """
+        Slices the function backward and forward from the criteria statements.
+
+        Args:
+            statements (list[Statement]): Slice criteria statements of the function.
+            control_depth (int): Slice depth for control flow dependencies.
+            data_dependent_depth (int): Slice depth for data dependencies.
+            control_dependent_depth (int): Slice depth for control-dependent statements.
+                A depth of -1 means no limit for all of them.
+
+        Returns:
+            list[Statement]: The sliced statements, in source order.
+
+        Raises:
+            ValueError: If a criteria statement is not in the function.
+        """
+        sources = [self.graph.index(stat) for stat in statements]
+        sliced: set[int] = set(sources)
+        for base, depth in (
+            ("control", control_depth),
+            ("data_dependent", data_dependent_depth),
+            ("control_dependent", control_dependent_depth),
+        ):
+            depth = 2048 if depth == -1 else depth
+            for adjacency in self._edges[base]:
+                sliced |= self._reach([adjacency], sources, depth)
+        return [self.graph.statements[i] for i in sorted(sliced)]
+
+
+def _call_targets(function: Function) -> dict[Statement, list[Function]]:
+    """
+    The functions with a body that are called at each call site of a function.
+    """
+    from .function import Function
+
+    targets: dict[Statement, list[Function]] = defaultdict(list)
+    for callee, call_sites in function.callees.items():
+        if not isinstance(callee, Function):
+            continue
+        for call_site in call_sites:
+            targets[call_site].append(callee)
+    return targets
+
+
+def _argument_index(identifier: Identifier, callee: Function) -> int | None:
+    """
+    The index of the parameter of the callee that receives the call argument an identifier is in.
+    """
+    node = identifier.node
+    stop = identifier.statement.node
+    while node.parent is not None and node != stop:
+        arguments = node.parent
+        call = arguments.parent
+        node = arguments
+        if call is None or call.child_by_field_name("arguments") != arguments:
+            continue
+        target = call.child_by_field_name("function") or call.child_by_field_name(
+            "name"
+        )
+        if target is None or target.text is None:
+            continue
+        language = callee.language
+        if language.call_target_name(target) != callee.name:
+            continue
+        names = [parameter.text for parameter in callee.parameters]
+        argument = identifier.node
+        while argument is not None and argument.parent != arguments:
+            argument = argument.parent
+        if argument is None:
+            return None
+        name = argument.child_by_field_name("name")
+        if name is not None and name.text is not None:
+            keyword = name.text.decode()
+            return names.index(keyword) if keyword in names else None
+        index = [
+            child for child in arguments.named_children if child.type != "comment"
+        ].index(argument)
+        index += language.receiver_offset(target, names)
+        return index if index < len(names) else None
+    return None
+
+
+def statement_variables(stat: Statement) -> list[Identifier]:
+    """
+    The variables a statement itself reads or writes, excluding those of the statements nested in a block.
+
+    Args:
+        stat (Statement): The statement.
+
+    Returns:
+        list[Identifier]: The :attr:`BlockStatement.block_variables` of a block statement,
+            or the :attr:`Statement.variables` of a simple statement.
+    """
+    if isinstance(stat, BlockStatement):
+        return stat.block_variables
+    return stat.variables
+
+
+class FunctionSummary:
+    """
+    The interprocedural summary of a function, computed once from its program dependence graph.
+
+    For each parameter, it records the statements of the function transitively data or control dependent on it,
+    whether it reaches a return value, and the sinks it flows into: the arguments of the calls it reaches.
+    It also records the statements the return values depend on. Interprocedural slices are composed from
+    the summaries of the functions they cross, instead of walking their bodies again.
+    """
+
+    function: Function
+    """The summarized function."""
+
+    parameter_slices: list[list[Statement]]
+    """The statements dependent on each parameter, in source order."""
+
+    parameter_returns: list[bool]
+    """Whether each parameter reaches a return value."""
+
+    parameter_sinks: list[list[tuple[Statement, Function, int]]]
+    """The call sites, callees and parameter indexes of the callees each parameter flows into."""
+
+    return_slice: list[Statement]
+    """The statements the return values depend on, in source order."""
+
+    def __init__(self, function: Function):
+        self.function = function
+        pdg = function.program_dependence_graph
+        graph = pdg.graph
+        definitions = function.reaching_definitions
+        exits = {graph.index(stat) for stat in function.exits if stat in graph}
+        self.parameter_slices = []
+        self.parameter_returns = []
+        self.parameter_sinks = []
+        for parameter in function.parameters:
+            uses = definitions.uses(parameter) if parameter.statement in graph else []
+            sources = sorted({graph.index(use.statement) for use in uses})
+            reached = pdg._dependence_closure(sources, backward=False)
+            self.parameter_slices.append([graph.statements[i] for i in sorted(reached)])
+            self.parameter_returns.append(not exits.isdisjoint(reached))
+            self.parameter_sinks.append(_sinks(function, reached, set(uses)))
+        reached = pdg._dependence_closure(sorted(exits), backward=True)
+        self.return_slice = [graph.statements[i] for i in sorted(reached)]
+
+
+def _sinks(
+    function: Function, reached: set[int], tainted: set[Identifier]
+) -> list[tuple[Statement, Function, int]]:
+    """
+    The call arguments of a function that carry values of the reached statements or tainted identifiers.
+    """
+    graph = function.control_flow_graph
+    definitions = function.reaching_definitions
+    sinks = []
+    for call_site, callees in _call_targets(function).items():
+        if call_site not in graph or graph.index(call_site) not in reached:
+            continue
+        for var in statement_variables(call_site):
+            if var not in tainted and all(
+                graph.index(definition.statement) not in reached
+                for definition in definitions.definitions(var)
+            ):
+                continue
+            for callee in callees:
+                index = _argument_index(var, callee)
+                if index is not None and (call_site, callee, index) not in sinks:
+                    sinks.append((call_site, callee, index))
+    return sinks
+
+
+class InterproceduralSlicer:
+    """
+    Slices across function boundaries by composing the :class:`FunctionSummary` of each function.
+
+    Within a function, a slice is the transitive data and control dependence closure of its criteria.
+    Backward, a call site pulls in the statements the return values of its callees depend on,
+    and a parameter the slice depends on pulls in the arguments passed to it by the callers.
+    Forward, a tainted call argument pulls in the statements dependent on the parameter receiving it,
+    and a return value reached from the criteria flows on from the call sites of the callers.
+    """
+
+    def __init__(self, call_depth: int = -1):
+        self.call_depth = call_depth
+        self.sliced: set[Statement] = set()
+
+    def _within_depth(self, level: int) -> bool:
+        return self.call_depth == -1 or level <= self.call_depth
+
+    def backward(self, function: Function, statements: list[Statement]):
+        """
+        Adds the backward slice of the criteria statements of a function.
+        """
+        visited_returns: set[Function] = set()
+        visited_callers: set[tuple[Function, Statement]] = set()
+        work: deque[tuple[Function, list[Statement], int]] = deque(
+            [(function, statements, 0)]
+        )
+        while work:
+            function, statements, level = work.popleft()
+            pdg = function.program_dependence_graph
+            graph = pdg.graph
+            sources = [graph.index(stat) for stat in statements if stat in graph]
+            reached = pdg._dependence_closure(sources, backward=True)
+            self.sliced.update(graph.statements[i] for i in reached)
+            if not self._within_depth(level + 1):
+                continue
+            # descend into the return values of the callees
+            returns: deque[tuple[Function, int]] = deque(
+                (callee, level + 1)
+                for call_site, callees in _call_targets(function).items()
+                if call_site in graph and graph.index(call_site) in reached
+                for callee in callees
+            )
+            while returns:
+                callee, callee_level = returns.popleft()
+                if callee in visited_returns:
+                    continue
+                visited_returns.add(callee)
+                summary = callee.summary
+                self.sliced.update(summary.return_slice)
+                if not self._within_depth(callee_level + 1):
+                    continue
+                return_slice = set(summary.return_slice)
+                for call_site, callees in _call_targets(callee).items():
+                    if call_site in return_slice:
+                        returns.extend((c, callee_level + 1) for c in callees)
+            # ascend to the arguments of the parameters the slice depends on
+            needed = []
+            for index, parameter in enumerate(function.parameters):
+                if parameter.statement not in graph:
+                    continue
+                uses = function.reaching_definitions.uses(parameter)
+                if any(graph.index(use.statement) in reached for use in uses):
+                    needed.append(index)
+            if not needed:
+                continue
+            for caller, call_sites in function.callers.items():
+                if caller is None:
+                    continue
+                caller_graph = caller.control_flow_graph
+                caller_definitions = caller.reaching_definitions
+                for call_site in call_sites:
+                    if (caller, call_site) in visited_callers:
+                        continue
+                    visited_callers.add((caller, call_site))
+                    if call_site not in caller_graph:
+                        continue
+                    self.sliced.add(call_site)
+                    arguments = set()
+                    for var in statement_variables(call_site):
+                        if _argument_index(var, function) in needed:
+                            for definition in caller_definitions.definitions(var):
+                                arguments.add(definition.statement)
+                    work.append((caller, list(arguments), level + 1))
+
+    def forward(self, function: Function, statements: list[Statement]):
+        """
+        Adds the forward slice of the criteria statements of a function.
+        """
+        visited_parameters: set[tuple[Function, int]] = set()
+        visited_callers: set[Function] = set()
+        # the values of the criteria flow into their calls, the return values into the call sites only
+        work: deque[tuple[Function, list[Statement], int, bool]] = deque(
+            [(function, statements, 0, True)]
+        )
+        while work:
+            function, statements, level, criteria = work.popleft()
+            pdg = function.program_dependence_graph
+            graph = pdg.graph
+            sources = [graph.index(stat) for stat in statements if stat in graph]
+            reached = pdg._dependence_closure(sources, backward=False)
+            self.sliced.update(graph.statements[i] for i in reached)
+            if not self._within_depth(level + 1):
+                continue
+            tainted = set()
+            if criteria:
+                tainted = {
+                    var for stat in statements for var in statement_variables(stat)
+                }
+            # descend into the parameters receiving tainted arguments
+            parameters: deque[tuple[Function, int, int]] = deque(
+                (callee, index, level + 1)
+                for _, callee, index in _sinks(function, reached, tainted)
+            )
+            while parameters:
+                callee, index, callee_level = parameters.popleft()
+                if (callee, index) in visited_parameters:
+                    continue
+                visited_parameters.add((callee, index))
+                summary = callee.summary
+                self.sliced.update(summary.parameter_slices[index])
+                if self._within_depth(callee_level + 1):
+                    parameters.extend(
+                        (c, i, callee_level + 1)
+                        for _, c, i in summary.parameter_sinks[index]
+                    )
+            # a reached return value flows on from the call sites of the callers
+            exits = [stat for stat in function.exits if stat in graph]
+            if function in visited_callers or not any(
+                graph.index(stat) in reached for stat in exits
+            ):
+                continue
+            visited_callers.add(function)
+            for caller, call_sites in function.callers.items():
+                if caller is not None:
+                    work.append((caller, call_sites, level + 1, False))
@@ -1,24 +1,121 @@
 from __future__ import annotations
 
+import hashlib
+import itertools
 import os
-from functools import cached_property
+import pathlib
+from functools import cache, cached_property
 from typing import TYPE_CHECKING
 
 import chardet
 import networkx as nx
 from scubalspy import SyncLanguageServer
-from tree_sitter import Node
+from tree_sitter import Node, Tree
 
 from . import language as lang
 from .clazz import Class
+from .dataflow import ControlFlowGraph
 from .function import Function
-from .identifier import Identifier
-from .statement import BlockStatement, Statement
+from .identifier import Identifier, IdentifierIndex
+from .parser import Parser
+from .slots import cached_value, slot_cached_property
+from .statement import (
+    BlockStatement,
+    Statement,
+    byte_spans,
+    innermost_statement,
+    line_spans,
+    statements_spanning_line,
+)
 
 if TYPE_CHECKING:
+    from scubalspy.scubalspy_types import Position
+
+    from .lsp import LSPBatch
     from .project import Project
 
 
+def read_source(path: str) -> str:
+    """
+    Reads a source file from disk, detecting its encoding.
+
+    This is a module-level function so that it can be dispatched to worker processes.
+
+    Args:
+        path (str): The path of the file to read.
+
+    Returns:
+        str: The decoded content of the file.
+    """
+    with open(
+        path,
+        "rb",
+    ) as f:
+        data = f.read()
+        encoding = chardet.detect(data)["encoding"]
+        if encoding is None:
+            encoding = "utf-8"
+    with open(
+        path,
+        "r",
+        encoding=encoding,
+    ) as f:
+        return f.read()
+
+
+_file_ids: dict[str, int] = {}
+"""The integer ids of the file signatures, see :attr:`File.file_id`."""
+
+_next_file_id = itertools.count()
+
+_KEPT_STATEMENT_CACHES = {
+    "statements",
+    "identifiers",
+    "variables",
+    "block_identifiers",
+    "block_variables",
+    "function",
+}
+"""Cached properties of a statement that stay valid when it is kept across an edit."""
+
+_KEPT_CONTROL_CACHES = {
+    "prev_sibling",
+    "next_sibling",
+    "right_uncle_ancestor",
+    "preorder_successor",
+}
+"""Cached control-flow properties that stay valid for statements kept inside a function."""
+
+_KEPT_FUNCTION_CACHES = {"control_flow_graph"}
+"""Cached properties of a function that stay valid when it is kept across an edit, once reindexed."""
+
+_KEPT_IDENTIFIER_CACHES = {"is_left_value"}
+"""Cached properties of an identifier that stay valid when it is kept across an edit."""
+
+
+def _drop_cached_properties(obj: object, keep: set[str]):
+    cls = type(obj)
+    if hasattr(obj, "__dict__"):
+        for name in list(obj.__dict__):
+            if name not in keep and isinstance(
+                getattr(cls, name, None), cached_property
+            ):
+                del obj.__dict__[name]
+    for name, attr in _slot_cached_properties(cls):
+        if name not in keep and attr.is_cached(obj):
+            attr.__delete__(obj)
+
+
+@cache
+def _slot_cached_properties(cls: type) -> list[tuple[str, slot_cached_property]]:
+    properties = []
+    for name in dir(cls):
+        attr = getattr(cls, name, None)
+        if isinstance(attr, slot_cached_property):
+            properties.append((name, attr))
+    return properties
+
+
 class File:
     """
     A source code file in a project.
@@ -45,9 +142,8 @@ class File:
             path = path[7:]
         self._path = path
         self.project = project
-        self.__lsp_preload = False
-        self._is_build_cfg = False
         self._content = content
+        self._modified = content is not None
 
     @staticmethod
     def create(path: str, project: Project, content: str | None = None) -> File:
@@ -127,7 +223,7 @@ class File:
         """
         return os.path.abspath(self._path)
 
-    @property
+    @cached_property
     def relpath(self) -> str:
         """
         The relative path of the file with respect to the project directory.
@@ -150,23 +246,17 @@ class File:
         """
         if self._content is not None:
             return self._content
-        with open(
-            self._path,
-            "rb",
-        ) as f:
-            data = f.read()
-            encoding = chardet.detect(data)["encoding"]
-            if encoding is None:
-                encoding = "utf-8"
-        with open(
-            self._path,
-            "r",
-            encoding=encoding,
-        ) as f:
-            self._content = f.read()
-            return self._content
+        self._content = read_source(self._path)
+        return self._content
 
-    @property
+    @cached_property
+    def content_hash(self) -> str:
+        """
+        The SHA-256 hex digest of the content of the file.
+        """
+        return hashlib.sha256(self.text.encode("utf-8")).hexdigest()
+
+    @cached_property
     def lines(self) -> list[str]:
         """
         A list of the lines in the file.
@@ -183,6 +273,15 @@ class File:
     def signature(self) -> str:
         return self.relpath
 
+    @cached_property
+    def file_id(self) -> int:
+        """
+        A small integer identifying the file by its :attr:`signature`, shared by all its :class:`File` objects.
+
+        It stands for the file in the keys of statements and identifiers, which are compared often.
+        """
+        return _file_ids.setdefault(self.signature, next(_next_file_id))
+
     @property
     def parser(self):
         """
@@ -190,12 +289,19 @@ class File:
         """
         return self.project.parser
 
+    @cached_property
+    def tree(self) -> Tree:
+        """
+        The tree-sitter tree for the file.
+        """
+        return self.parser.parse_tree(self.text)
+
     @cached_property
     def node(self) -> Node:
         """
         The tree-sitter root node for the file.
         """
-        return self.parser.parse(self.text)
+        return self.tree.root_node
 
     @property
     def node_type(self) -> str:
@@ -215,17 +321,35 @@ class File:
         import_identifier_node = self.parser.query_all(
             self.text, self.language.query_import_identifier
         )
-        import_files = []
-        for node in import_identifier_node:
-            include = self.lsp.request_definition(
-                self.relpath,
-                node.start_point[0],
-                node.start_point[1],
+        return self._import_files(import_identifier_node)
+
+    def _import_files(self, import_identifier_node: list[Node]) -> list[File]:
+        """
+        Resolves the files of the import identifiers with the LSP.
+
+        The resolved paths are reused from the project :class:`AnalysisCache` when available.
+        """
+        if len(import_identifier_node) == 0:
+            return []
+        cache = self.project.analysis_cache
+        include_abspaths = None
+        if cache is not None:
+            include_abspaths = cache.get_resolved(self, "imports", "")
+        if include_abspaths is None:
+            batch = self.lsp_batch
+            includes = batch.gather(
+                [
+                    batch.definition(self.relpath, *node.start_point)
+                    for node in import_identifier_node
+                ]
             )
-            if len(include) == 0:
-                continue
-            include = include[0]
-            include_abspath = include["absolutePath"]
+            include_abspaths = [
+                include[0]["absolutePath"] for include in includes if len(include) > 0
+            ]
+            if cache is not None:
+                cache.put_resolved(self, "imports", "", include_abspaths)
+        import_files = []
+        for include_abspath in include_abspaths:
             if include_abspath in self.project.files_abspath:
                 import_files.append(self.project.files_abspath[include_abspath])
             else:
@@ -270,8 +394,20 @@ class File:
         """
         statements in the file.
         """
+        cache = self.project.analysis_cache
+        if cache is not None:
+            statements = cache.load_statements(self)
+            if statements is not None:
+                return statements
         return BlockStatement.build_statements(self.node, self)
 
+    @cached_property
+    def control_flow_graph(self) -> ControlFlowGraph:
+        """
+        The control flow graph of the statements outside functions, with functions as single nodes.
+        """
+        return ControlFlowGraph(self)
+
     @cached_property
     def identifiers(self) -> list[Identifier]:
         """
@@ -292,6 +428,13 @@ class File:
             variables.extend(stmt.variables)
         return variables
 
+    @property
+    def is_modified(self) -> bool:
+        """
+        Checks if the content of the file was given or edited in memory, so it may differ from the file on disk.
+        """
+        return self._modified
+
     @property
     def is_external(self) -> bool:
         """
@@ -301,16 +444,24 @@ class File:
 
     @property
     def lsp(self) -> SyncLanguageServer:
-        lsp = self.project.lsp
-        if self.__lsp_preload:
+        """
+        The language server of the file, with the file opened in it on demand.
+        When the project starts its servers in the background, this waits until the server is ready.
+
+        When the file is opened, its imports are opened along with it, and for C/C++ the
+        corresponding source or header files of the imports.
+        """
+        shard = self.project._lsp_shard(self)
+        if self.project.lsp_background:
+            self.project.lsp_readiness[shard].wait()
+        lsp = self.project.lsp_pool[shard]
+        open_files = self.project.lsp_open_files[shard]
+        if not open_files.open(self.relpath):
             return lsp
-        lsp.open_file(self.relpath).__enter__()
-        self.__lsp_preload = True
 
-        # preload all imports for the file
         for import_file in self.imports:
-            lsp.open_file(import_file.relpath).__enter__()
-            # preload corresponding source/header file if the file is C/C++
+            open_files.open(import_file.relpath)
+            # open the corresponding source/header file if the file is C/C++
             if self.language == lang.C:
                 heuristic_name_list = set(
                     [
@@ -328,13 +479,19 @@ class File:
                 )
                 # remove self's own file name from the heuristic list
                 heuristic_name_list.discard(import_file.name)
-                for relpath, file in self.project.files.items():
-                    for heuristic_name in heuristic_name_list:
-                        if relpath.endswith(heuristic_name):
-                            lsp.open_file(file.relpath).__enter__()
-                            break
+                for heuristic_name in heuristic_name_list:
+                    for file in self.project.files_by_name.get(heuristic_name, []):
+                        open_files.open(file.relpath)
         return lsp
 
+    @property
+    def lsp_batch(self) -> LSPBatch:
+        """
+        The :class:`LSPBatch` of the language server of the file, with the file and its imports opened in it.
+        """
+        self.lsp  # noqa: B018
+        return self.project.lsp_batches[self.project._lsp_shard(self)]
+
     def class_by_line(self, line: int) -> Class | None:
         """
         The class that contains the specified line number.
@@ -372,11 +529,33 @@ class File:
         Returns:
             Function | None: The function that contains the line, or None if not found.
         """
-        for func in self.functions:
-            if func.start_line <= line <= func.end_line:
-                return func
+        table = self._function_line_table
+        if 0 < line < len(table):
+            return table[line]
         return None
 
+    @cached_property
+    def _function_line_table(self) -> list[Function | None]:
+        """
+        The function that contains each line number, indexed by line.
+
+        Earlier functions take precedence, as with a linear scan over :attr:`functions`.
+        """
+        functions = self.functions
+        size = max([len(self.lines)] + [func.end_line for func in functions]) + 1
+        table: list[Function | None] = [None] * size
+        for func in reversed(functions):
+            table[func.start_line : func.end_line + 1] = [func] * func.length
+        return table
+
+    @cached_property
+    def _line_spans(self) -> tuple[list[int], list[int]]:
+        return line_spans(self.statements)
+
+    @cached_property
+    def _byte_spans(self) -> tuple[list[int], list[int]]:
+        return byte_spans(self.statements)
+
     def functions_by_name(self, name: str) -> list[Function]:
         """
         The functions that have the specified name.
@@ -407,17 +586,22 @@ class File:
             return func.statements_by_line(line)
 
         # If the line is not in a function, get the statement from the file
-        def collect_statements(statements: list[Statement]) -> list[Statement]:
-            for statement in statements:
+        def collect_statements(
+            statements: list[Statement], spans: tuple[list[int], list[int]]
+        ) -> list[Statement]:
+            for statement in statements_spanning_line(statements, spans, line):
+                if not isinstance(statement, Statement):
+                    continue
                 if isinstance(statement, BlockStatement):
-                    results = collect_statements(statement.statements)
+                    results = collect_statements(
+                        statement.statements, statement._line_spans
+                    )
                     if len(results) > 0:
                         return results
-                if statement.start_line <= line <= statement.end_line:
-                    return [statement]
+                return [statement]
             return []
 
-        return collect_statements(self.statements)
+        return collect_statements(self.statements, self._line_spans)
 
     def statements_by_field_name(self, field_name: str) -> list[Statement]:
         """
@@ -442,25 +626,256 @@ class File:
         Returns:
             Identifier | None: The identifier at the specified position, or None if not found.
         """
-        for identifier in self.identifiers:
-            if (
-                identifier.start_line == line
-                and identifier.start_column <= column <= identifier.end_column
+        return self._identifier_index.at(line, column)
+
+    @cached_property
+    def _identifier_index(self) -> IdentifierIndex:
+        return IdentifierIndex(self.identifiers)
+
+    def update(self, content: str):
+        """
+        Replaces the content of the file and reparses it incrementally.
+
+        The changed region is narrowed to the text between the common prefix and suffix
+        of the old and new content before it is applied with :meth:`apply_edit`.
+
+        Args:
+            content (str): The new content of the file.
+        """
+        old_text = self.text
+        if content == old_text:
+            return
+        start = 0
+        max_prefix = min(len(old_text), len(content))
+        while start < max_prefix and old_text[start] == content[start]:
+            start += 1
+        suffix = 0
+        max_suffix = max_prefix - start
+        while (
+            suffix < max_suffix
+            and old_text[len(old_text) - suffix - 1]
+            == content[len(content) - suffix - 1]
+        ):
+            suffix += 1
+        self.apply_edit(
+            start, len(old_text) - suffix, content[start : len(content) - suffix]
+        )
+
+    def apply_edit(self, start: int, end: int, new_text: str):
+        """
+        Replaces the text between two offsets of the file and reparses it incrementally.
+
+        The tree-sitter tree of the file is edited and reparsed with the old tree, so only
+        the changed regions are parsed again. Top-level statements outside of the changed
+        regions are kept with their sub-statements and identifiers rebound to the new tree,
+        as well as the CFG edges within their functions. Everything else is rebuilt lazily.
+
+        If the file is opened in the language server, the edit is sent to it as well.
+
+        Args:
+            start (int): The character offset where the replaced text starts.
+            end (int): The character offset where the replaced text ends.
+            new_text (str): The text to insert.
+        """
+        old_text = self.text
+        if not 0 <= start <= end <= len(old_text):
+            raise ValueError(f"Invalid edit range: {start}-{end}")
+        text = old_text[:start] + new_text + old_text[end:]
+        start_byte = len(old_text[:start].encode("utf-8"))
+        old_end_byte = start_byte + len(old_text[start:end].encode("utf-8"))
+        new_end_byte = start_byte + len(new_text.encode("utf-8"))
+
+        # the file may be open in several servers of the pool, as itself or as an import
+        lsp_uri = pathlib.Path(self.project.abspath, self.relpath).as_uri()
+        for lsp, open_files in zip(
+            getattr(self.project, "lsp_pool", []),
+            getattr(self.project, "lsp_open_files", []),
+        ):
+            if lsp_uri not in lsp.language_server.open_file_buffers:
+                continue
+            open_files.edit(
+                self.relpath,
+                self.__position(old_text, start),
+                self.__position(old_text, end),
+                new_text,
+            )
+
+        old_tree = self.__dict__.get("tree")
+        old_statements = self.__dict__.get("statements")
+        for name in [
+            "tree",
+            "node",
+            "content_hash",
+            "lines",
+            "imports",
+            "functions",
+            "classes",
+            "statements",
+            "identifiers",
+            "variables",
+            "_line_spans",
+            "_byte_spans",
+            "_function_line_table",
+            "_identifier_index",
+            "control_flow_graph",
+        ]:
+            self.__dict__.pop(name, None)
+        for name in ["functions", "entry_point", "name_resolver"]:
+            self.project.__dict__.pop(name, None)
+        lsp_cache = self.project.__dict__.get("lsp_cache")
+        if lsp_cache is not None:
+            lsp_cache.invalidate()
+        symbol_index = self.project.__dict__.get("symbol_index")
+        if symbol_index is not None:
+            symbol_index.invalidate(self)
+        analysis_cache = self.project.__dict__.get("analysis_cache")
+        if analysis_cache is not None:
+            analysis_cache.__dict__.pop("fingerprint", None)
+        self._content = text
+        self._modified = True
+        if old_tree is None:
+            return
+
+        old_source = old_text.encode("utf-8")
+        new_source = text.encode("utf-8")
+        old_tree.edit(
+            start_byte=start_byte,
+            old_end_byte=old_end_byte,
+            new_end_byte=new_end_byte,
+            start_point=self.__point(old_source, start_byte),
+            old_end_point=self.__point(old_source, old_end_byte),
+            new_end_point=self.__point(new_source, new_end_byte),
+        )
+        tree = self.parser.parse_tree(text, old_tree)
+        self.__dict__["tree"] = tree
+        if old_statements is None:
+            return
+
+        changed_ranges = [
+            (r.start_byte, r.end_byte) for r in old_tree.changed_ranges(tree)
+        ]
+        changed_ranges.append((start_byte, new_end_byte))
+        delta = new_end_byte - old_end_byte
+        # old nodes keep their positions before the edit, map them to the new tree
+        kept: dict[tuple[int, int, str], Statement] = {}
+        for stat in old_statements:
+            stat_start, stat_end = stat.node.start_byte, stat.node.end_byte
+            if stat_end < start_byte:
+                shift = 0
+            elif stat_start > old_end_byte:
+                shift = delta
+            else:
+                continue
+            if any(
+                stat_start + shift <= changed_end and changed_start <= stat_end + shift
+                for changed_start, changed_end in changed_ranges
             ):
-                return identifier
-        return None
+                continue
+            kept[(stat_start + shift, stat_end + shift, stat.node.type)] = stat
 
-    def build_cfg(self):
-        def build_pre_cfg(statements: list[Statement]):
-            for i in range(len(statements)):
-                cur_stat = statements[i]
-                for post_stat in cur_stat.post_controls:
-                    post_stat._pre_control_statements.append(cur_stat)
-                if isinstance(cur_stat, BlockStatement):
-                    build_pre_cfg(cur_stat.statements)
+        statements = BlockStatement.build_statements(tree.root_node, self)
+        for index, stat in enumerate(statements):
+            key = (stat.node.start_byte, stat.node.end_byte, stat.node.type)
+            old_stat = kept.get(key)
+            if old_stat is None or type(old_stat) is not type(stat):
+                continue
+            shift = key[0] - old_stat.node.start_byte
+            if self.__rebind(old_stat, tree.root_node, shift):
+                statements[index] = old_stat
+        self.__dict__["statements"] = statements
+
+    @staticmethod
+    def __position(text: str, offset: int) -> Position:
+        line = text.count("\n", 0, offset)
+        return {"line": line, "character": offset - text.rfind("\n", 0, offset) - 1}
+
+    @staticmethod
+    def __point(source: bytes, byte: int) -> tuple[int, int]:
+        return (source.count(b"\n", 0, byte), byte - source.rfind(b"\n", 0, byte) - 1)
+
+    def __rebind(self, top_stat: Statement, root: Node, shift: int) -> bool:
+        """
+        Rebinds the nodes of a statement subtree kept across an edit to the new tree.
+
+        Only caches that are local to the subtree are kept. The CFG edges are only kept
+        inside functions, since the edges of other statements may lead to changed siblings.
+
+        Returns:
+            bool: True if all nodes were found in the new tree, otherwise False.
+        """
+        from .field import Field
+
+        rebound: list[tuple[Statement | Field | Identifier, Node]] = []
+        identifiers: dict[int, Identifier] = {}
+        stack: list[tuple[Statement | Field, bool]] = [(top_stat, False)]
+        while stack:
+            stat, in_function = stack.pop()
+            node = Parser.find_node(
+                root,
+                stat.node.start_byte + shift,
+                stat.node.end_byte + shift,
+                stat.node.type,
+            )
+            if node is None:
+                return False
+            rebound.append((stat, node))
+            if isinstance(stat, Field):
+                continue
+            for name in [
+                "identifiers",
+                "variables",
+                "block_identifiers",
+                "block_variables",
+            ]:
+                for identifier in cached_value(stat, name, []):
+                    identifiers[id(identifier)] = identifier
+            children = cached_value(stat, "statements", [])
+            child_in_function = in_function or isinstance(stat, Function)
+            stack.extend((child, child_in_function) for child in children)
+
+        for identifier in identifiers.values():
+            node = Parser.find_node(
+                root,
+                identifier.node.start_byte + shift,
+                identifier.node.end_byte + shift,
+                identifier.node.type,
+            )
+            if node is None:
+                return False
+            rebound.append((identifier, node))
+
+        for obj, node in rebound:
+            obj.node = node
+        for identifier in identifiers.values():
+            _drop_cached_properties(identifier, _KEPT_IDENTIFIER_CACHES)
+        stack = [(top_stat, False)]
+        while stack:
+            stat, in_function = stack.pop()
+            if isinstance(stat, Field):
+                continue
+            keep = _KEPT_STATEMENT_CACHES
+            if in_function:
+                keep = keep | _KEPT_CONTROL_CACHES
+            elif hasattr(stat, "_post_controls"):
+                del stat._post_controls
+            if isinstance(stat, Function):
+                keep = keep | _KEPT_FUNCTION_CACHES
+            _drop_cached_properties(stat, keep)
+            graph = stat.__dict__.get("control_flow_graph")
+            if graph is not None:
+                graph.reindex()
+            child_in_function = in_function or isinstance(stat, Function)
+            stack.extend(
+                (child, child_in_function)
+                for child in cached_value(stat, "statements", [])
+            )
+        return True
 
-        build_pre_cfg(self.statements)
-        self._is_build_cfg = True
+    def build_cfg(self):
+        """
+        Builds the control flow graph of the file, see :attr:`control_flow_graph`.
+        """
+        _ = self.control_flow_graph
 
     def __build_cfg_graph(self, graph: nx.DiGraph, statments: list[Statement]):
         for stat in statments:
@@ -514,28 +929,12 @@ class File:
         if node is None:
             node = self.node
         matched_nodes = self.parser.query_all(node, query)
-        matched_statements = set()
-        visited_nodes = set()
-
-        def collect_matching_statements(stat: Statement):
-            if isinstance(stat, BlockStatement):
-                for child in stat.statements:
-                    collect_matching_statements(child)
-
-            for node in matched_nodes:
-                if node in visited_nodes:
-                    continue
-                node_in_stat = (
-                    node.start_byte >= stat.node.start_byte
-                    and node.end_byte <= stat.node.end_byte
-                )
-                if node_in_stat:
-                    matched_statements.add(stat)
-                    visited_nodes.add(node)
-
-        for statement in self.statements:
-            collect_matching_statements(statement)
-        return list(matched_statements)
+        matched_statements = []
+        for matched_node in matched_nodes:
+            stat = innermost_statement(self.statements, self._byte_spans, matched_node)
+            if stat is not None:
+                matched_statements.append(stat)
+        return list(dict.fromkeys(matched_statements))
 
     def query_oneshot(self, query: str) -> Statement | None:
         """
@@ -569,16 +968,7 @@ class File:
         if node is None:
             node = self.node
         matched_nodes = self.parser.query_all(node, query)
-        matched_identifiers = []
-        for identifier in self.identifiers:
-            for node in matched_nodes:
-                if (
-                    identifier.node.start_byte >= node.start_byte
-                    and identifier.node.end_byte <= node.end_byte
-                ):
-                    matched_identifiers.append(identifier)
-                    break
-        return matched_identifiers
+        return self._identifier_index.within(matched_nodes)
 
     def query_identifier(
         self, query: str, node: Node | None = None
@@ -9,8 +9,19 @@ import networkx as nx
 from tree_sitter import Node
 
 from . import language as lang
+from .dataflow import (
+    ControlDependenceGraph,
+    ControlFlowGraph,
+    DominatorTree,
+    FunctionSummary,
+    InterproceduralSlicer,
+    ProgramDependenceGraph,
+    ReachingDefinitions,
+)
 from .identifier import Identifier
+from .slots import slot_cached_property
 from .statement import BlockStatement, Statement
+from .taint import TaintAnalysis
 
 if TYPE_CHECKING:
     from .clazz import Class
@@ -25,7 +36,6 @@ class Function(BlockStatement):
 
     def __init__(self, node: Node, file: File | BlockStatement):
         super().__init__(node, file)
-        self._is_build_cfg = False
 
     @staticmethod
     def create(node: Node, parent: File | Class | BlockStatement):
@@ -82,7 +92,7 @@ class Function(BlockStatement):
         else:
             return Function(node, parent)
 
-    @cached_property
+    @slot_cached_property
     def statements(self) -> list[Statement]:
         """
         Statements in the function.
@@ -206,6 +216,76 @@ class Function(BlockStatement):
         exits = self.statements_by_types(self.language.EXIT_STATEMENTS, recursive=True)
         return exits
 
+    @cached_property
+    def control_flow_graph(self) -> ControlFlowGraph:
+        """
+        The control flow graph of the function, of which the :attr:`Statement.pre_controls`
+        and :attr:`Statement.post_controls` of its statements are views, and on which its
+        dataflow analyses run.
+        """
+        return ControlFlowGraph(self)
+
+    @cached_property
+    def dominator_tree(self) -> DominatorTree:
+        """
+        The dominator tree of the function, rooted at the function itself.
+        """
+        return DominatorTree(self)
+
+    @cached_property
+    def post_dominator_tree(self) -> DominatorTree:
+        """
+        The post-dominator tree of the function, rooted at a virtual exit.
+        """
+        return DominatorTree(self, post=True)
+
+    @cached_property
+    def control_dependence_graph(self) -> ControlDependenceGraph:
+        """
+        The control dependence graph of the function, from which
+        :attr:`Statement.pre_control_dependents` and :attr:`Statement.post_control_dependents` are read.
+        """
+        return ControlDependenceGraph(self)
+
+    @property
+    def post_controls(self) -> list[Statement]:
+        # the function enters its body, then continues in the graph it is a node of
+        post_controls = self.control_flow_graph.post_controls(self)
+        for post in super().post_controls:
+            if post not in post_controls:
+                post_controls.append(post)
+        return post_controls
+
+    @cached_property
+    def reaching_definitions(self) -> ReachingDefinitions:
+        """
+        The reaching definitions of the function, from which the def-use chains of its variables
+        (:attr:`Identifier.pre_data_dependents` and :attr:`Identifier.post_data_dependents`) are read.
+        """
+        return ReachingDefinitions(self)
+
+    @cached_property
+    def program_dependence_graph(self) -> ProgramDependenceGraph:
+        """
+        The program dependence graph of the function, against which it is sliced.
+        """
+        return ProgramDependenceGraph(self)
+
+    @cached_property
+    def summary(self) -> FunctionSummary:
+        """
+        The interprocedural summary of the function, from which slices crossing it are composed.
+        """
+        return FunctionSummary(self)
+
+    @cached_property
+    def taint_analysis(self) -> TaintAnalysis:
+        """
+        The taint analysis of the function with its parameters as sources,
+        from which :attr:`Identifier.is_taint_from_entry` and :attr:`Statement.is_taint_from_entry` are read.
+        """
+        return TaintAnalysis(self)
+
     @cached_property
     def accessible_functions(self) -> list[Function]:
         funcs = []
@@ -234,6 +314,10 @@ class Function(BlockStatement):
     def _has_cpg(self) -> bool:
         return getattr(self.file.project, "cpg", None) is not None
 
+    @property
+    def _has_lsp(self) -> bool:
+        return hasattr(self.file.project, "lsp")
+
     @cached_property
     def _cpg_method(self) -> CpgNode | None:
         if not self._has_cpg:
@@ -330,44 +414,55 @@ class Function(BlockStatement):
     ) -> dict[Function | FunctionDeclaration | DummyFunction, list[Statement]]:
         """
         The functions, function declarations, or external dummy functions that are called by this function and their corresponding call sites.
+
+        Without an LSP server or a CPG, the calls are resolved by name with the :attr:`Project.name_resolver`.
         """
         if self._has_cpg:
             return self._cpg_callees()
+        if not self._has_lsp:
+            callees = defaultdict(list)
+            for call in self.file.project.name_resolver.calls(self):
+                if call.call_site not in callees[call.callee]:
+                    callees[call.callee].append(call.call_site)
+            return dict(callees)
+        return self._callees_at(self._callee_locations())
+
+    def _set_callee_locations(self, callee_locations: dict[str, list | None]):
+        """
+        Caches the :attr:`callees` from definition locations resolved ahead with :meth:`_callee_locations`,
+        such as concurrently by :meth:`Project.full_callgraph`.
+        """
+        self.__dict__["callees"] = self._callees_at(callee_locations)
 
-        lsp = self.lsp
+    def _callees_at(
+        self, callee_locations: dict[str, list | None]
+    ) -> dict[Function | FunctionDeclaration | DummyFunction, list[Statement]]:
+        """
+        Maps the resolved definition locations of :meth:`_callee_locations` to the called functions.
+        """
         callees = defaultdict(set[Statement])
         for call_stat in self.calls:
             for identifier in call_stat.identifiers:
-                call_hierarchys = lsp.request_prepare_call_hierarchy(
-                    self.file.relpath,
-                    identifier.node.start_point[0],
-                    identifier.node.start_point[1],
+                location = callee_locations.get(
+                    f"{identifier.start_line}:{identifier.start_column}"
                 )
-                if len(call_hierarchys) == 0:
+                if location is None:
                     continue
-                callee_def = lsp.request_definition(
-                    call_stat.file.relpath,
-                    identifier.node.start_point[0],
-                    identifier.node.start_point[1],
-                )
-                if len(callee_def) == 0:
-                    continue
-                callee_def = callee_def[0]
+                callee_uri, callee_line = location
                 # external file
-                if callee_def["uri"] not in self.file.project.files_uri:
-                    if len(callee_def["uri"]) == 0:
+                if callee_uri not in self.file.project.files_uri:
+                    if len(callee_uri) == 0:
                         callees[DummyFunction(identifier.text)].add(
                             identifier.statement
                         )
                         continue
                     from .file import File
 
-                    self.file.project.files_uri[callee_def["uri"]] = File.create(
-                        callee_def["uri"],
+                    self.file.project.files_uri[callee_uri] = File.create(
+                        callee_uri,
                         self.file.project,
                     )
-                callee_file = self.file.project.files_uri[callee_def["uri"]]
-                callee_line = callee_def["range"]["start"]["line"] + 1
+                callee_file = self.file.project.files_uri[callee_uri]
                 callee_func = callee_file.function_by_line(callee_line)
                 if callee_func == self:
                     continue  # avoid self-references
@@ -380,6 +475,54 @@ class Function(BlockStatement):
         callees = {k: list(v) for k, v in callees.items()}
         return callees
 
+    def _callee_locations(self) -> dict[str, list | None]:
+        """
+        Resolves the definition location of every identifier in the call statements with the LSP.
+
+        The requests are pipelined with the :attr:`Project.lsp_batch`: the call hierarchies of all the
+        identifiers are prepared concurrently, then the definitions of the callable ones.
+
+        Returns a mapping from ``"line:column"`` of each identifier to ``[uri, line]`` of its definition,
+        or None if it does not resolve to a callable. Reused from the project :class:`AnalysisCache` when available.
+        """
+        cache = self.file.project.analysis_cache
+        key = f"{self.start_line}:{self.start_column}"
+        if cache is not None:
+            cached = cache.get_resolved(self.file, "callees", key)
+            if cached is not None:
+                return cached
+
+        batch = self.file.lsp_batch
+        relpath = self.file.relpath
+        positions = {}
+        for call_stat in self.calls:
+            for identifier in call_stat.identifiers:
+                identifier_key = f"{identifier.start_line}:{identifier.start_column}"
+                positions.setdefault(identifier_key, identifier.node.start_point)
+        locations: dict[str, list | None] = dict.fromkeys(positions)
+        # only the identifiers naming a callable are resolved to their definitions
+        call_hierarchys = batch.gather(
+            [batch.prepare_call_hierarchy(relpath, *p) for p in positions.values()]
+        )
+        callables = [
+            identifier_key
+            for identifier_key, items in zip(positions, call_hierarchys)
+            if len(items) > 0
+        ]
+        callee_defs = batch.gather(
+            [batch.definition(relpath, *positions[k]) for k in callables]
+        )
+        for identifier_key, callee_def in zip(callables, callee_defs):
+            if len(callee_def) == 0:
+                continue
+            locations[identifier_key] = [
+                callee_def[0]["uri"],
+                callee_def[0]["range"]["start"]["line"] + 1,
+            ]
+        if cache is not None:
+            cache.put_resolved(self.file, "callees", key, locations)
+        return locations
+
     def _cpg_callers(self) -> dict[Function, list[Statement]]:
         if self._cpg_method is None:
             return {}
@@ -403,27 +546,22 @@ class Function(BlockStatement):
     def callers(self) -> dict[Function, list[Statement]]:
         """
         The functions that call this function and their corresponding call sites.
+
+        Without an LSP server or a CPG, the calls are resolved by name with the :attr:`Project.name_resolver`.
         """
         if self._has_cpg:
             return self._cpg_callers()
+        if not self._has_lsp:
+            callers = defaultdict(list)
+            for call in self.file.project.name_resolver.callers(self):
+                if call.call_site not in callers[call.caller]:
+                    callers[call.caller].append(call.call_site)
+            return dict(callers)
 
-        lsp = self.lsp
-        call_hierarchy = lsp.request_prepare_call_hierarchy(
-            self.file.relpath,
-            self.name_node.start_point[0],
-            self.name_node.start_point[1],
-        )
-        if len(call_hierarchy) == 0:
-            return {}
-        call_hierarchy = call_hierarchy[0]
-        calls = lsp.request_incoming_calls(call_hierarchy)
         callers = defaultdict(list[Statement])
-        for call in calls:
-            from_ = call["from_"]
-            fromRanges = call["fromRanges"]
-            caller_file = self.file.project.files_uri[from_["uri"]]
-            for fromRange in fromRanges:
-                callsite_line = fromRange["start"]["line"] + 1
+        for caller_uri, callsite_lines in self._caller_locations():
+            caller_file = self.file.project.files_uri[caller_uri]
+            for callsite_line in callsite_lines:
                 callsite_stats = caller_file.statements_by_line(callsite_line)
                 for stat in callsite_stats:
                     if self.name in stat.text:
@@ -431,6 +569,45 @@ class Function(BlockStatement):
                         break
         return callers
 
+    def _caller_locations(self) -> list[list]:
+        """
+        Resolves the incoming calls of the function with the LSP.
+
+        Returns a list of ``[uri, callsite lines]`` for each caller.
+        Reused from the project :class:`AnalysisCache` when available.
+        """
+        cache = self.file.project.analysis_cache
+        key = f"{self.start_line}:{self.start_column}"
+        if cache is not None:
+            locations = cache.get_resolved(self.file, "callers", key)
+            if locations is not None:
+                return locations
+
+        batch = self.file.lsp_batch
+        locations = []
+        [call_hierarchy] = batch.gather(
+            [
+                batch.prepare_call_hierarchy(
+                    self.file.relpath, *self.name_node.start_point
+                )
+            ]
+        )
+        if len(call_hierarchy) > 0:
+            [incoming_calls] = batch.gather([batch.incoming_calls(call_hierarchy[0])])
+            for call in incoming_calls:
+                locations.append(
+                    [
+                        call["from_"]["uri"],
+                        [
+                            from_range["start"]["line"] + 1
+                            for from_range in call["fromRanges"]
+                        ],
+                    ]
+                )
+        if cache is not None:
+            cache.put_resolved(self.file, "callers", key, locations)
+        return locations
+
     def walk_backward(
         self,
         filter: Callable[[Statement], bool] | None = None,
@@ -444,8 +621,8 @@ class Function(BlockStatement):
             depth=depth,
             base=base,
         ):
-            assert isinstance(caller, Function)
-            yield caller
+            assert base != "call" or isinstance(caller, Function)
+            yield caller  # type: ignore
 
     def walk_forward(
         self,
@@ -460,8 +637,8 @@ class Function(BlockStatement):
             depth=depth,
             base=base,
         ):
-            assert isinstance(callee, Function)
-            yield callee
+            assert base != "call" or isinstance(callee, Function)
+            yield callee  # type: ignore
 
     def __build_callgraph(self, depth: int = -1) -> nx.MultiDiGraph:
         cg = nx.MultiDiGraph()
@@ -531,6 +708,51 @@ class Function(BlockStatement):
         nx.nx_pydot.write_dot(cg, path)
         return cg
 
+    def slice_many(
+        self,
+        criteria: list[list[Statement]],
+        *,
+        control_depth: int = 1,
+        data_dependent_depth: int = 1,
+        control_dependent_depth: int = 1,
+    ) -> list[list[Statement]]:
+        """
+        Slices the function by many criteria, sharing its program dependence graph between them.
+
+        Args:
+            criteria (list[list[Statement]]): The slice criteria statements of each slice.
+            control_depth (int): Slice depth for control flow dependencies.
+            data_dependent_depth (int): Slice depth for data dependencies.
+            control_dependent_depth (int): Slice depth for control-dependent statements.
+
+        Returns:
+            list[list[Statement]]: The sliced statements of each criteria, in the same order.
+        """
+        pdg = self.program_dependence_graph
+        slices = []
+        for statements in criteria:
+            sliced = set(
+                pdg.slice(
+                    [stat for stat in statements if stat in pdg],
+                    control_depth=control_depth,
+                    data_dependent_depth=data_dependent_depth,
+                    control_dependent_depth=control_dependent_depth,
+                )
+            )
+            for stat in statements:
+                if stat in pdg:
+                    continue
+                # statements outside the function are walked from their own views
+                for base, depth in (
+                    ("control", control_depth),
+                    ("data_dependent", data_dependent_depth),
+                    ("control_dependent", control_dependent_depth),
+                ):
+                    sliced.update(stat.walk_backward(depth=depth, base=base))
+                    sliced.update(stat.walk_forward(depth=depth, base=base))
+            slices.append(sorted(sliced, key=lambda x: x.node.start_byte))
+        return slices
+
     def slice_by_statements(
         self,
         statements: list[Statement],
@@ -551,29 +773,40 @@ class Function(BlockStatement):
         Returns:
             list[Statement]: A list of statements that are sliced based on the provided statements.
         """
-        res = set()
-        for stat in statements:
-            for s in stat.walk_backward(depth=control_depth, base="control"):
-                res.add(s)
-            for s in stat.walk_forward(depth=control_depth, base="control"):
-                res.add(s)
-            for s in stat.walk_backward(
-                depth=data_dependent_depth, base="data_dependent"
-            ):
-                res.add(s)
-            for s in stat.walk_forward(
-                depth=data_dependent_depth, base="data_dependent"
-            ):
-                res.add(s)
-            for s in stat.walk_backward(
-                depth=control_dependent_depth, base="control_dependent"
-            ):
-                res.add(s)
-            for s in stat.walk_forward(
-                depth=control_dependent_depth, base="control_dependent"
-            ):
-                res.add(s)
-        return sorted(list(res), key=lambda x: x.node.start_byte)
+        return self.slice_many(
+            [statements],
+            control_depth=control_depth,
+            data_dependent_depth=data_dependent_depth,
+            control_dependent_depth=control_dependent_depth,
+        )[0]
+
+    def slice_interprocedural(
+        self,
+        statements: list[Statement],
+        *,
+        direction: str = "backward",
+        call_depth: int = -1,
+    ) -> list[Statement]:
+        """
+        Slices the program across function boundaries, following data through calls with function summaries.
+
+        Args:
+            statements (list[Statement]): Slice criteria statements of the function.
+            direction (str): The direction of the slice.
+                Can be "backward", "forward", or "both".
+            call_depth (int): The maximum number of calls or returns to cross. Default is -1, which means no limit.
+
+        Returns:
+            list[Statement]: The sliced statements of all the functions crossed, ordered by file and position.
+        """
+        if direction not in ("backward", "forward", "both"):
+            raise ValueError(f"Unsupported slice direction: {direction}")
+        slicer = InterproceduralSlicer(call_depth)
+        if direction in ("backward", "both"):
+            slicer.backward(self, statements)
+        if direction in ("forward", "both"):
+            slicer.forward(self, statements)
+        return sorted(slicer.sliced, key=lambda x: (x.file.relpath, x.node.start_byte))
 
     def slice_by_lines(
         self,
@@ -609,21 +842,10 @@ class Function(BlockStatement):
         )
 
     def build_cfg(self):
-        def build_pre_cfg(statements: list[Statement]):
-            for i in range(len(statements)):
-                cur_stat = statements[i]
-                for post_stat in cur_stat.post_controls:
-                    post_stat._pre_control_statements.append(cur_stat)
-                if isinstance(cur_stat, BlockStatement):
-                    build_pre_cfg(cur_stat.statements)
-
-        build_pre_cfg(self.statements)
-        if len(self.statements) > 0:
-            self.statements[0]._pre_control_statements.insert(0, self)
-            self._post_control_statements = [self.statements[0]]
-        else:
-            self._post_control_statements = []
-        self._is_build_cfg = True
+        """
+        Builds the control flow graph of the function, see :attr:`control_flow_graph`.
+        """
+        _ = self.control_flow_graph
 
     def __build_cfg_graph(self, graph: nx.DiGraph, statments: list[Statement]):
         for stat in statments:
@@ -677,8 +899,6 @@ class Function(BlockStatement):
             with_cdg (bool): Whether to include the Control Dependence Graph (CDG).
             with_ddg (bool): Whether to include the Data Dependence Graph (DDG).
         """
-        if not self._is_build_cfg:
-            self.build_cfg()
         graph = nx.MultiDiGraph()
         graph.add_node("graph", bgcolor="ivory", splines="true")
         graph.add_node(
@@ -1,4 +1,5 @@
 from ..identifier import Identifier
 
 
-class GoIdentifier(Identifier): ...
+class GoIdentifier(Identifier):
+    __slots__ = ()
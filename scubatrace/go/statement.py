@@ -1,13 +1,10 @@
 from __future__ import annotations
 
-from functools import cached_property
-
 from ..statement import BlockStatement, SimpleStatement, Statement
 
 
 class GoSimpleStatement(SimpleStatement):
-    @cached_property
-    def post_controls(self) -> list[Statement]:
+    def _build_post_controls(self) -> list[Statement]:
         if self.node_type in self.language.EXIT_STATEMENTS:
             return []
         exits_statements = self.function.exits if self.function is not None else []
@@ -82,8 +79,7 @@ class GoSimpleStatement(SimpleStatement):
 
 
 class GoBlockStatement(BlockStatement):
-    @cached_property
-    def post_controls(self) -> list[Statement]:
+    def _build_post_controls(self) -> list[Statement]:
         exits_statements = self.function.exits if self.function is not None else []
         last_defer_statement = []
         from .function import GoFunction
@@ -127,6 +123,9 @@ class GoBlockStatement(BlockStatement):
         nexts = [self.statements[0]] if len(self.statements) > 0 else []
         if self.preorder_successor is not None:
             nexts.append(self.preorder_successor)
+        elif self.node_type in self.language.LOOP_STATEMENTS:
+            # a loop that ends the function runs the deferred calls when it exits
+            nexts.extend(last_defer_statement)
 
         if len(last_defer_statement) > 0:
             nexts = [stat for stat in nexts if stat not in exits_statements]
@@ -1,4 +1,5 @@
 from ..identifier import Identifier
 
 
-class JavaIdentifier(Identifier): ...
+class JavaIdentifier(Identifier):
+    __slots__ = ()
@@ -1,4 +1,5 @@
 from ..identifier import Identifier
 
 
-class JavaScriptIdentifier(Identifier): ...
+class JavaScriptIdentifier(Identifier):
+    __slots__ = ()
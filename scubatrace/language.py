@@ -1,4 +1,6 @@
+import re
 from abc import abstractmethod
+from functools import cache
 
 from tree_sitter import Node
 
@@ -107,6 +109,17 @@ class Language:
         """
         ...
 
+    @classmethod
+    @cache
+    def query_left_values(cls) -> str:
+        """
+        The tree-sitter query to match left values of any name.
+
+        This is :meth:`query_left_value` without its text predicates, so a statement can be queried
+        once for all of its left values; each captured node is a left value of its own text.
+        """
+        return re.sub(r'\(#eq\? @left ""\)', "", cls.query_left_value(""))
+
     @staticmethod
     @abstractmethod
     def query_goto_label(label_name: str) -> str:
@@ -195,6 +208,35 @@ class Language:
 
         return node.type in cls.SIMPLE_STATEMENTS
 
+    @classmethod
+    def call_target_name(cls, node: Node) -> str:
+        """
+        The name of the function a call targets, without its receiver or scope.
+
+        Args:
+            node (Node): The function node of the call, such as ``obj.method`` or ``ns::func``.
+
+        Returns:
+            str: The name of the called function, such as ``method`` or ``func``.
+        """
+        assert node.text is not None
+        return re.split(r"\W+", node.text.decode())[-1]
+
+    @classmethod
+    def receiver_offset(cls, node: Node, parameters: list[str]) -> int:
+        """
+        The number of leading parameters of the callee that are not bound to call arguments,
+        such as a receiver passed implicitly by a method call.
+
+        Args:
+            node (Node): The function node of the call.
+            parameters (list[str]): The parameter names of the callee.
+
+        Returns:
+            int: The index of the parameter bound to the first call argument.
+        """
+        return 0
+
     # C = scubalspy_config.Language.C
     # JAVA = scubalspy_config.Language.JAVA
     # PYTHON = scubalspy_config.Language.PYTHON
@@ -0,0 +1,545 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any
+
+from scubalspy import SyncLanguageServer
+
+if TYPE_CHECKING:
+    from scubalspy.scubalspy_types import Position
+
+    from .project import Project
+
+
+class LSPResponseCache:
+    """
+    A least-recently-used cache of LSP responses shared by the requests of a project.
+
+    Responses are keyed by the request method, its arguments and the content hash of the file
+    the request is issued from. The futures of the requests are cached rather than their results,
+    so a request still in flight is shared by the callers asking the same question. Since a
+    response may point into any file of the project, the cache is cleared by :meth:`invalidate`
+    whenever a file changes. The responses that outlive the process are recorded in the
+    :class:`AnalysisCache` of the project by the properties resolving them.
+    """
+
+    project: Project
+    """The project whose requests are cached."""
+
+    maxsize: int
+    """The maximum number of cached responses."""
+
+    hits: int
+    """The number of requests answered by the cache."""
+
+    misses: int
+    """The number of requests sent to a language server."""
+
+    def __init__(self, project: Project, maxsize: int = 16384):
+        self.project = project
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._futures: OrderedDict[Hashable, Future] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+    def key(self, method: str, *args: Any) -> Hashable:
+        """
+        The cache key of a request.
+
+        Args:
+            method (str): The request method, such as ``"request_definition"``.
+            *args (Any): The arguments of the request, starting with the relative path of
+                the file it is issued from for position requests.
+
+        Returns:
+            Hashable: The key of the request.
+        """
+        file = None
+        if len(args) > 0 and isinstance(args[0], str):
+            file = self.project.files.get(args[0])
+        parts = [
+            json.dumps(arg, sort_keys=True) if isinstance(arg, (dict, list)) else arg
+            for arg in args
+        ]
+        return (method, *parts, file.content_hash if file is not None else None)
+
+    def get(self, key: Hashable) -> Future | None:
+        """
+        Looks up the future of a cached request, marking it as recently used.
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._futures.move_to_end(key)
+            return future
+
+    def put(self, key: Hashable, future: Future):
+        """
+        Caches the future of a request, evicting the least recently used ones beyond :attr:`maxsize`.
+        Failed requests are dropped from the cache.
+        """
+        with self._lock:
+            self._futures[key] = future
+            while len(self._futures) > self.maxsize:
+                self._futures.popitem(last=False)
+
+        def discard_failed(future: Future):
+            if not future.cancelled() and future.exception() is None:
+                return
+            with self._lock:
+                if self._futures.get(key) is future:
+                    del self._futures[key]
+
+        future.add_done_callback(discard_failed)
+
+    def invalidate(self):
+        """
+        Drops all the cached responses, after a change of a project file.
+        """
+        with self._lock:
+            self._futures.clear()
+
+
+class LSPBatch:
+    """
+    Issues LSP requests concurrently over the connection of a :class:`SyncLanguageServer`.
+
+    The blocking requests of :class:`SyncLanguageServer` wait for each response before the next
+    request is sent, so resolving many positions costs one round trip each. A batch schedules the
+    requests on the event loop of the server without waiting, so they are in flight together and
+    the server answers them as fast as it can, then gathers the responses.
+    """
+
+    lsp: SyncLanguageServer
+    """The language server the requests are sent to."""
+
+    cache: LSPResponseCache | None
+    """The cache answering repeated requests, if any."""
+
+    def __init__(
+        self,
+        lsp: SyncLanguageServer,
+        max_pending: int = 64,
+        cache: LSPResponseCache | None = None,
+    ):
+        """
+        Args:
+            lsp (SyncLanguageServer): A started language server.
+            max_pending (int): The maximum number of requests in flight. Submitting more
+                blocks until a response arrives.
+            cache (LSPResponseCache | None): The cache answering repeated requests, if any.
+        """
+        self.lsp = lsp
+        self.cache = cache
+        self._pending = threading.BoundedSemaphore(max_pending)
+
+    def submit(self, method: str, *args: Any) -> Future:
+        """
+        Sends a request to the language server without waiting for its response.
+
+        Args:
+            method (str): The name of the request method of the asynchronous language server,
+                such as ``"request_definition"``.
+            *args (Any): The arguments of the request.
+
+        Returns:
+            Future: The future of the response, shared with the identical requests
+                in the :attr:`cache`. The response must not be modified.
+        """
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(method, *args)
+            future = self.cache.get(key)
+            if future is not None:
+                return future
+        request = getattr(self.lsp.language_server, method)(*args)
+        self._pending.acquire()
+        try:
+            future = asyncio.run_coroutine_threadsafe(request, self.lsp.loop)  # type: ignore
+        except BaseException:
+            self._pending.release()
+            request.close()
+            raise
+        future.add_done_callback(lambda _: self._pending.release())
+        if self.cache is not None and key is not None:
+            self.cache.put(key, future)
+        return future
+
+    def definition(self, relpath: str, line: int, column: int) -> Future:
+        """
+        Sends a ``textDocument/definition`` request for a zero-based position.
+        """
+        return self.submit("request_definition", relpath, line, column)
+
+    def references(self, relpath: str, line: int, column: int) -> Future:
+        """
+        Sends a ``textDocument/references`` request for a zero-based position.
+        """
+        return self.submit("request_references", relpath, line, column)
+
+    def prepare_call_hierarchy(self, relpath: str, line: int, column: int) -> Future:
+        """
+        Sends a ``textDocument/prepareCallHierarchy`` request for a zero-based position.
+        """
+        return self.submit("request_prepare_call_hierarchy", relpath, line, column)
+
+    def hover(self, relpath: str, line: int, column: int) -> Future:
+        """
+        Sends a ``textDocument/hover`` request for a zero-based position.
+        """
+        return self.submit("request_hover", relpath, line, column)
+
+    def incoming_calls(self, item: dict) -> Future:
+        """
+        Sends a ``callHierarchy/incomingCalls`` request for a call hierarchy item.
+        """
+        return self.submit("request_incoming_calls", item)
+
+    def gather(self, futures: list[Future]) -> list[Any]:
+        """
+        Waits for the responses of requests.
+
+        Args:
+            futures (list[Future]): The futures returned by the requests of the batch.
+
+        Returns:
+            list[Any]: The responses, in the order of the futures.
+        """
+        return [future.result(timeout=self.lsp.timeout) for future in futures]
+
+
+class LSPOpenFiles:
+    """
+    The files open in a language server, opened on demand and closed least recently used first.
+
+    Language servers keep an AST and diagnostics for every open file, so opening the whole project
+    upfront takes long and grows the memory of the server with the project size. At most
+    :attr:`max_open` files are kept open here, except the pinned files whose buffers were edited,
+    which the server would otherwise read back from disk when they are opened again. Requests
+    on a closed file still succeed, as the server opens it for the duration of the request.
+    """
+
+    lsp: SyncLanguageServer
+    """The language server the files are opened in."""
+
+    max_open: int | None
+    """The maximum number of files kept open, or None for no limit."""
+
+    def __init__(self, lsp: SyncLanguageServer, max_open: int | None = 512):
+        self.lsp = lsp
+        self.max_open = max_open
+        self._contexts: OrderedDict[str, Any] = OrderedDict()
+        self._pinned: set[str] = set()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._contexts)
+
+    def __contains__(self, relpath: str) -> bool:
+        return relpath in self._contexts
+
+    def _call(self, function: Any) -> Any:
+        # the open file buffers are shared with the requests running on the event loop
+        async def call():
+            return function()
+
+        return asyncio.run_coroutine_threadsafe(call(), self.lsp.loop).result()  # type: ignore
+
+    def open(self, relpath: str) -> bool:
+        """
+        Opens a file in the language server, or marks it as recently used if it is open.
+
+        Args:
+            relpath (str): The path of the file relative to the project.
+
+        Returns:
+            bool: True if the file was opened by this call.
+        """
+        with self._lock:
+            if relpath in self._contexts:
+                self._contexts.move_to_end(relpath)
+                return False
+            context = self.lsp.open_file(relpath)
+            self._call(context.__enter__)
+            self._contexts[relpath] = context
+            if self.max_open is not None and len(self._contexts) > self.max_open:
+                for closed in self._contexts:
+                    if closed not in self._pinned and closed != relpath:
+                        self.close(closed)
+                        break
+            return True
+
+    def pin(self, relpath: str):
+        """
+        Keeps an open file open until it is closed explicitly.
+        """
+        with self._lock:
+            if relpath in self._contexts:
+                self._pinned.add(relpath)
+
+    def edit(
+        self,
+        relpath: str,
+        start: Position,
+        end: Position,
+        new_text: str,
+    ):
+        """
+        Replaces the text between two positions in the buffer of a file open in the language server,
+        and keeps the file open until it is closed explicitly.
+
+        The buffer is edited on the event loop of the server, in order with the files opened and closed.
+
+        Args:
+            relpath (str): The path of the file relative to the project.
+            start (Position): The position where the replaced text starts.
+            end (Position): The position where the replaced text ends.
+            new_text (str): The text to insert.
+        """
+
+        def edit():
+            if start != end:
+                self.lsp.delete_text_between_positions(relpath, start, end)
+            if len(new_text) > 0:
+                self.lsp.insert_text_at_position(
+                    relpath, start["line"], start["character"], new_text
+                )
+
+        with self._lock:
+            self.pin(relpath)
+            self._call(edit)
+
+    def close(self, relpath: str):
+        """
+        Closes a file in the language server, if it is open.
+        """
+        with self._lock:
+            context = self._contexts.pop(relpath, None)
+            self._pinned.discard(relpath)
+            if context is not None:
+                self._call(lambda: context.__exit__(None, None, None))
+
+    def close_all(self):
+        """
+        Closes all the open files.
+        """
+        with self._lock:
+            for relpath in list(self._contexts):
+                self.close(relpath)
+
+
+class _ProgressHandlers(dict):
+    """
+    The notification handlers of a language server, calling a tracker before the ``$/progress`` handler.
+    """
+
+    def __init__(self, track: Callable[[dict], None], handlers: dict):
+        super().__init__()
+        self.track = track
+        for method, callback in handlers.items():
+            self[method] = callback
+
+    def __setitem__(self, method: str, callback: Callable | None):
+        if method != "$/progress":
+            super().__setitem__(method, callback)
+            return
+
+        async def on_progress(params):
+            if isinstance(params, dict):
+                self.track(params)
+            if callback is not None:
+                await callback(params)
+
+        super().__setitem__(method, on_progress)
+
+
+class LSPReadiness:
+    """
+    Starts a language server in the background and tracks its readiness from the ``$/progress`` notifications it sends.
+
+    Language servers keep indexing the workspace after the ``initialize`` handshake, and answer requests
+    with partial results or late meanwhile. The servers reporting their work with ``$/progress``, such as
+    jdtls or rust-analyzer, are ready once every reported work has ended; the others as soon as they are started.
+    Since a server may announce its work only after the handshake, a server offered ``window.workDoneProgress``
+    by the client is not ready before its first ``begin``, or before :attr:`grace` seconds without one.
+    """
+
+    lsp: SyncLanguageServer
+    """The tracked language server."""
+
+    started: Future
+    """Resolved once the server is started, or with the error of its start."""
+
+    future: Future
+    """Resolved once the server is started and has no work in progress, or with the error of its start."""
+
+    progress: dict[str | int, dict]
+    """The work in progress of the server by progress token, with the fields of its last ``$/progress`` value."""
+
+    max_wait: float | None
+    """The maximum number of seconds to wait for the work in progress after the start, or None for no limit."""
+
+    grace: float
+    """The number of seconds to wait after the start for the first work of a server that reports its progress."""
+
+    on_progress: Callable[[dict], None] | None
+    """Called from the event loop of the server with each ``$/progress`` value and its ``token``."""
+
+    def __init__(
+        self,
+        lsp: SyncLanguageServer,
+        max_wait: float | None = 600,
+        on_progress: Callable[[dict], None] | None = None,
+        grace: float = 2,
+    ):
+        self.lsp = lsp
+        self.max_wait = max_wait
+        self.on_progress = on_progress
+        self.grace = grace
+        self.progress = {}
+        self.started = Future()
+        self.future = Future()
+        self._started = False
+        self._awaiting_begin = False
+        self._lock = threading.Lock()
+        self._track_progress()
+
+    def _track_progress(self):
+        handler = self.lsp.language_server.server
+        # the servers register their own handler when they start, which is chained to the tracker
+        handler.on_notification_handlers = _ProgressHandlers(
+            self._update, handler.on_notification_handlers
+        )
+        handler.on_notification_handlers["$/progress"] = None
+
+        async def create_progress(params):
+            return None
+
+        handler.on_request("window/workDoneProgress/create", create_progress)
+
+        send_request = handler.send.send_request
+
+        async def track_initialize(method: str, params: dict | None = None):
+            if method == "initialize" and isinstance(params, dict):
+                window = params.get("capabilities", {}).get("window") or {}
+                with self._lock:
+                    self._awaiting_begin = bool(window.get("workDoneProgress"))
+            return await send_request(method, params)
+
+        handler.send.send_request = track_initialize
+
+    def _update(self, params: dict):
+        token, value = params.get("token"), params.get("value")
+        if token is None or not isinstance(value, dict):
+            return
+        with self._lock:
+            if value.get("kind") == "end":
+                self.progress.pop(token, None)
+            else:
+                self.progress[token] = {**self.progress.get(token, {}), **value}
+                self._awaiting_begin = False
+        if self.on_progress is not None:
+            self.on_progress({"token": token, **value})
+        self._resolve()
+
+    def _resolve(self, expired: bool = False):
+        with self._lock:
+            if self.future.done() or not self._started:
+                return
+            if expired or (len(self.progress) == 0 and not self._awaiting_begin):
+                self.future.set_result(None)
+
+    def _end_grace(self):
+        with self._lock:
+            self._awaiting_begin = False
+        self._resolve()
+
+    def start(self) -> Future:
+        """
+        Starts the language server in a background thread.
+
+        Returns:
+            Future: The :attr:`future` of the readiness of the server.
+        """
+
+        def run():
+            try:
+                self.lsp.sync_start_server()
+            except Exception as e:  # noqa: BLE001
+                # raised by the calls waiting for the server instead
+                self.started.set_exception(e)
+                self.future.set_exception(e)
+                return
+            with self._lock:
+                self._started = True
+                awaiting_begin = self._awaiting_begin
+            self.started.set_result(None)
+            self._resolve()
+            if awaiting_begin:
+                timer = threading.Timer(self.grace, self._end_grace)
+                timer.daemon = True
+                timer.start()
+            if self.max_wait is not None and not self.future.done():
+                timer = threading.Timer(self.max_wait, self._resolve, (True,))
+                timer.daemon = True
+                timer.start()
+
+        threading.Thread(target=run, daemon=True).start()
+        return self.future
+
+    def wait(self, timeout: float | None = None):
+        """
+        Waits until the language server is ready.
+
+        Args:
+            timeout (float | None): The maximum number of seconds to wait, or None for no limit.
+
+        Raises:
+            TimeoutError: If the server is not ready in time.
+            Exception: The error of the start of the server, if it failed.
+        """
+        self.future.result(timeout)
+
+    @staticmethod
+    def all(readiness: list[LSPReadiness]) -> Future:
+        """
+        Combines the readiness of several language servers.
+
+        Args:
+            readiness (list[LSPReadiness]): The tracked language servers.
+
+        Returns:
+            Future: Resolved once all the servers are ready, or with the first error of their start.
+        """
+        ready: Future = Future()
+        pending = [len(readiness)]
+        lock = threading.Lock()
+
+        def done(future: Future):
+            with lock:
+                if ready.done():
+                    return
+                if future.exception() is not None:
+                    ready.set_exception(future.exception())  # type: ignore
+                    return
+                pending[0] -= 1
+                if pending[0] == 0:
+                    ready.set_result(None)
+
+        if len(readiness) == 0:
+            ready.set_result(None)
+        for server in readiness:
+            server.future.add_done_callback(done)
+        return ready
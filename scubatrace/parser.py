@@ -1,18 +1,93 @@
+import threading
+from collections import OrderedDict
 from typing import Generator
 
 from tree_sitter import Language as TSLanguage
-from tree_sitter import Node, Tree
+from tree_sitter import Node, Query, Tree
 from tree_sitter import Parser as TSParser
 
 
+class QueryCache:
+    """
+    A bounded LRU cache of compiled tree-sitter queries for a single language.
+
+    Compiling a query is far more expensive than running it, and the same query
+    strings are issued for every statement and identifier of a project.
+    Query strings built per identifier text (e.g. :meth:`Language.query_left_value`)
+    are cached as well; the size bound keeps them from growing without limit.
+    """
+
+    maxsize: int
+    """The maximum number of compiled queries kept in the cache."""
+
+    hits: int
+    """The number of lookups answered from the cache."""
+
+    misses: int
+    """The number of lookups that required compiling the query."""
+
+    def __init__(self, language: TSLanguage, maxsize: int = 1024) -> None:
+        self.language = language
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._queries: OrderedDict[str, Query] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+    def get(self, query_str: str) -> Query:
+        """
+        Returns the compiled query for the query string, compiling it on a miss.
+
+        Args:
+            query_str (str): The tree-sitter query to compile.
+
+        Returns:
+            Query: The compiled tree-sitter query.
+        """
+        with self._lock:
+            query = self._queries.get(query_str)
+            if query is not None:
+                self._queries.move_to_end(query_str)
+                self.hits += 1
+                return query
+            self.misses += 1
+        query = self.language.query(query_str)
+        with self._lock:
+            self._queries[query_str] = query
+            self._queries.move_to_end(query_str)
+            while len(self._queries) > self.maxsize:
+                self._queries.popitem(last=False)
+        return query
+
+    def clear(self) -> None:
+        """
+        Removes all compiled queries and resets the hit/miss counters.
+        """
+        with self._lock:
+            self._queries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
 class Parser:
     """
     A parser for a specific programming language using tree-sitter.
     """
 
+    query_cache: QueryCache
+    """The compiled query cache shared by all parsers of the same language."""
+
+    _query_caches: dict[TSLanguage, QueryCache] = {}
+
     def __init__(self, language: TSLanguage) -> None:
         self.language = language
         self.parser = TSParser(language)
+        if language not in Parser._query_caches:
+            Parser._query_caches[language] = QueryCache(language)
+        self.query_cache = Parser._query_caches[language]
 
     def parse(self, code: str) -> Node:
         """
@@ -24,7 +99,47 @@ class Parser:
         Returns:
             Node: The root node of the tree-sitter AST.
         """
-        return self.parser.parse(bytes(code, "utf-8")).root_node
+        return self.parse_tree(code).root_node
+
+    def parse_tree(self, code: str, old_tree: Tree | None = None) -> Tree:
+        """
+        Parses the given code and returns the tree-sitter tree.
+
+        Args:
+            code (str): The code to parse.
+            old_tree (Tree | None): A previous tree of the code, already edited with :meth:`Tree.edit`.
+                If given, the unchanged parts of it are reused to parse the code incrementally.
+
+        Returns:
+            Tree: The tree-sitter tree of the code.
+        """
+        if old_tree is None:
+            return self.parser.parse(bytes(code, "utf-8"))
+        return self.parser.parse(bytes(code, "utf-8"), old_tree)
+
+    @staticmethod
+    def find_node(root: Node, start_byte: int, end_byte: int, type: str) -> Node | None:
+        """
+        Finds the node of the given type that spans exactly the given byte range.
+
+        Args:
+            root (Node): The node to search in.
+            start_byte (int): The start byte of the node.
+            end_byte (int): The end byte of the node.
+            type (str): The type of the node.
+
+        Returns:
+            Node | None: The matching node, or None if there is no such node.
+        """
+        node = root.descendant_for_byte_range(start_byte, end_byte)
+        while node is not None:
+            if node.start_byte != start_byte or node.end_byte != end_byte:
+                if node.start_byte < start_byte or node.end_byte > end_byte:
+                    return None
+            elif node.type == type:
+                return node
+            node = node.parent
+        return None
 
     @staticmethod
     def traverse_tree(tree: Tree | Node) -> Generator[Node, None, None]:
@@ -67,7 +182,7 @@ class Parser:
             node = target
         else:
             raise ValueError("target must be a string or Node")
-        query = self.language.query(query_str)
+        query = self.query_cache.get(query_str)
         captures = query.captures(node)
         return captures
 
@@ -1,4 +1,5 @@
 from ..identifier import Identifier
 
 
-class PHPIdentifier(Identifier): ...
+class PHPIdentifier(Identifier):
+    __slots__ = ()
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import atexit
 import os
+import weakref
+import zlib
 from abc import abstractmethod
 from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from functools import cached_property
 
 import networkx as nx
@@ -14,9 +17,25 @@ from scubalspy.scubalspy_logger import ScubalspyLogger
 
 from . import joern
 from . import language as lang
-from .file import File
+from .cache import AnalysisCache
+from .callgraph import CallGraph
+from .file import File, read_source
 from .function import DummyFunction, Function, FunctionDeclaration
+from .lsp import LSPBatch, LSPOpenFiles, LSPReadiness, LSPResponseCache
 from .parser import Parser
+from .resolver import NameResolver
+from .slots import cached_value
+from .statement import BlockStatement, Statement
+from .symbols import SymbolIndex
+
+_cached_projects: weakref.WeakSet[Project] = weakref.WeakSet()
+"""The projects with an analysis cache, saved at exit without keeping them alive."""
+
+
+@atexit.register
+def _save_caches():
+    for project in list(_cached_projects):
+        project.save_cache()
 
 
 class Project:
@@ -28,6 +47,16 @@ class Project:
     """The file system path to the project root."""
     language: type[lang.Language]
     """The programming language type for the project."""
+    lsp_pool: list[SyncLanguageServer]
+    """The language servers of the project when LSP is enabled, the first of which is :attr:`lsp`."""
+    lsp_open_files: list[LSPOpenFiles]
+    """The files open in each language server of the :attr:`lsp_pool`."""
+    lsp_readiness: list[LSPReadiness]
+    """The startup and indexing progress of each language server of the :attr:`lsp_pool`."""
+    lsp_ready: Future
+    """Resolved once all the language servers are started and done indexing, or with the error of their start."""
+    max_open_files: int | None = 512
+    """The maximum number of files kept open in each language server, or None for no limit."""
 
     @staticmethod
     def create(
@@ -35,6 +64,9 @@ class Project:
         language: type[lang.Language],
         enable_lsp: bool = True,
         joern_config: joern.JoernConfig | None = None,
+        cache_dir: str | None = None,
+        lsp_servers: int = 1,
+        lsp_background: bool = False,
     ) -> Project:
         """
         Factory function to create a language-specific :class:`Project` instance.
@@ -45,6 +77,14 @@ class Project:
             enable_lsp (bool, optional): Whether to enable Language Server Protocol (LSP) support. Defaults to True.
                 Note: For PHP and Swift, LSP is always disabled.
             joern_config (JoernConfig | None, optional): Configuration for Joern integration. If provided, Joern will be used to generate a CPG for the project.
+            cache_dir (str | None, optional): The directory of a persistent analysis cache. If provided, per-file analysis results are
+                reused across runs for unchanged files. See :class:`AnalysisCache` and :meth:`save_cache`.
+            lsp_servers (int, optional): The number of language server processes started over the project, each serving
+                a shard of the files. Defaults to 1. See :meth:`lsp_for`.
+            lsp_background (bool, optional): Whether to return while the language servers start and index the project
+                in the background, for example to parse the files with :meth:`preload` meanwhile. The calls using the
+                LSP then wait for the readiness of their server. Defaults to False, which returns once the servers are
+                started, while they may still be indexing; :attr:`lsp_ready` can be waited for explicitly.
 
         Returns:
             Project: An instance of the appropriate language-specific Project subclass.
@@ -55,43 +95,63 @@ class Project:
         if language == lang.C:
             from .cpp.project import CProject
 
-            return CProject(path, enable_lsp, joern_config)
+            return CProject(
+                path, enable_lsp, joern_config, cache_dir, lsp_servers, lsp_background
+            )
         elif language == lang.JAVA:
             from .java.project import JavaProject
 
-            return JavaProject(path, enable_lsp, joern_config)
+            return JavaProject(
+                path, enable_lsp, joern_config, cache_dir, lsp_servers, lsp_background
+            )
         elif language == lang.PYTHON:
             from .python.project import PythonProject
 
-            return PythonProject(path, enable_lsp, joern_config)
+            return PythonProject(
+                path, enable_lsp, joern_config, cache_dir, lsp_servers, lsp_background
+            )
         elif language == lang.JAVASCRIPT:
             from .javascript.project import JavaScriptProject
 
-            return JavaScriptProject(path, enable_lsp, joern_config)
+            return JavaScriptProject(
+                path, enable_lsp, joern_config, cache_dir, lsp_servers, lsp_background
+            )
         elif language == lang.GO:
             from .go.project import GoProject
 
-            return GoProject(path, enable_lsp, joern_config)
+            return GoProject(
+                path, enable_lsp, joern_config, cache_dir, lsp_servers, lsp_background
+            )
         elif language == lang.RUST:
             from .rust.project import RustProject
 
-            return RustProject(path, enable_lsp, joern_config)
+            return RustProject(
+                path, enable_lsp, joern_config, cache_dir, lsp_servers, lsp_background
+            )
         elif language == lang.CSHARP:
             from .csharp.project import CSharpProject
 
-            return CSharpProject(path, enable_lsp, joern_config)
+            return CSharpProject(
+                path, enable_lsp, joern_config, cache_dir, lsp_servers, lsp_background
+            )
         elif language == lang.RUBY:
             from .ruby.project import RubyProject
 
-            return RubyProject(path, enable_lsp, joern_config)
+            return RubyProject(
+                path, enable_lsp, joern_config, cache_dir, lsp_servers, lsp_background
+            )
         elif language == lang.PHP:
             from .php.project import PHPProject
 
-            return PHPProject(path, enable_lsp=False, joern_config=joern_config)
+            return PHPProject(
+                path, enable_lsp=False, joern_config=joern_config, cache_dir=cache_dir
+            )
         elif language == lang.SWIFT:
             from .swift.project import SwiftProject
 
-            return SwiftProject(path, enable_lsp=False, joern_config=joern_config)
+            return SwiftProject(
+                path, enable_lsp=False, joern_config=joern_config, cache_dir=cache_dir
+            )
         else:
             raise ValueError("Unsupported language for project creation")
 
@@ -101,10 +161,18 @@ class Project:
         language: type[lang.Language],
         enable_lsp: bool = True,
         joern_config: joern.JoernConfig | None = None,
+        cache_dir: str | None = None,
+        lsp_servers: int = 1,
+        lsp_background: bool = False,
     ):
         self.path = path
         self.language = language
         self.joern_config = joern_config
+        self.cache_dir = cache_dir
+        self.lsp_servers = lsp_servers
+        self.lsp_background = lsp_background
+        if cache_dir is not None:
+            _cached_projects.add(self)
         if enable_lsp:
             self.start_lsp()
         if joern_config is not None and joern_config.enable:
@@ -138,11 +206,6 @@ class Project:
             return
         else:
             raise ValueError("Unsupported language")
-        self.lsp = SyncLanguageServer.create(
-            ScubalspyConfig.from_dict({"code_language": lsp_language}),
-            ScubalspyLogger(),
-            os.path.abspath(self.path),
-        )
         if self.language == lang.C:
             self.conf_file = os.path.join(self.path, "compile_flags.txt")
             if not os.path.exists(self.conf_file):
@@ -150,7 +213,89 @@ class Project:
                     for sub_dir in self.sub_dirs:
                         f.write(f"-I{sub_dir}\n")
                 atexit.register(os.remove, self.conf_file)
-        self.lsp.sync_start_server()
+        self.lsp_pool = [
+            SyncLanguageServer.create(
+                ScubalspyConfig.from_dict({"code_language": lsp_language}),
+                ScubalspyLogger(),
+                os.path.abspath(self.path),
+            )
+            for _ in range(max(1, self.lsp_servers))
+        ]
+        self.lsp = self.lsp_pool[0]
+        self.lsp_open_files = [
+            LSPOpenFiles(lsp, self.max_open_files) for lsp in self.lsp_pool
+        ]
+        # the servers start and index the workspace concurrently, each in its own thread
+        self.lsp_readiness = [LSPReadiness(lsp) for lsp in self.lsp_pool]
+        for readiness in self.lsp_readiness:
+            readiness.start()
+        self.lsp_ready = LSPReadiness.all(self.lsp_readiness)
+        if not self.lsp_background:
+            # the servers keep indexing the workspace after their start, see lsp_ready
+            for readiness in self.lsp_readiness:
+                readiness.started.result()
+
+    def lsp_for(self, file: File) -> SyncLanguageServer:
+        """
+        The language server of the :attr:`lsp_pool` serving a file.
+
+        Files are sharded across the servers by a hash of their relative path, so a file is always
+        served by the same server, where it is opened along with its imports.
+
+        Args:
+            file (File): A file of the project.
+
+        Returns:
+            SyncLanguageServer: The language server of the file.
+        """
+        return self.lsp_pool[self._lsp_shard(file)]
+
+    def _lsp_shard(self, file: File) -> int:
+        if len(self.lsp_pool) == 1:
+            return 0
+        return zlib.crc32(file.relpath.encode("utf-8")) % len(self.lsp_pool)
+
+    @cached_property
+    def lsp_batches(self) -> list[LSPBatch]:
+        """
+        The :class:`LSPBatch` sending concurrent requests to each language server of the :attr:`lsp_pool`.
+        """
+        return [LSPBatch(lsp, cache=self.lsp_cache) for lsp in self.lsp_pool]
+
+    @cached_property
+    def lsp_cache(self) -> LSPResponseCache:
+        """
+        The in-memory :class:`LSPResponseCache` shared by the :attr:`lsp_batches`, cleared when a file is edited.
+        """
+        return LSPResponseCache(self)
+
+    @property
+    def lsp_batch(self) -> LSPBatch:
+        """
+        The :class:`LSPBatch` sending concurrent requests to the first language server of the project.
+        """
+        return self.lsp_batches[0]
+
+    @cached_property
+    def analysis_cache(self) -> AnalysisCache | None:
+        """
+        The persistent :class:`AnalysisCache` of the project, or None if no cache directory is configured.
+        """
+        if self.cache_dir is None:
+            return None
+        return AnalysisCache(self.cache_dir, self)
+
+    def save_cache(self):
+        """
+        Writes the analysis results computed so far to the cache directory, if one is configured.
+
+        This is also done automatically when the interpreter exits, for the projects still alive then.
+        Long-running processes should call it before dropping a project, as the results of a collected
+        project are not saved.
+        """
+        cache = self.__dict__.get("analysis_cache")
+        if cache is not None:
+            cache.save()
 
     @property
     def abspath(self) -> str:
@@ -196,6 +341,54 @@ class Project:
                     file_lists[key] = File.create(file_abs_path, self)
         return file_lists
 
+    def preload(self, workers: int | None = None, build_statements: bool = True):
+        """
+        Reads, parses and builds the statements of all project files in bulk.
+
+        Reading and encoding detection run in a process pool. Parsing and statement
+        building run in the current process afterwards, because tree-sitter trees
+        cannot be shared across processes.
+
+        Args:
+            workers (int | None, optional): The number of worker processes. Defaults to the number of CPUs.
+                If set to 1, files are read in the current process.
+            build_statements (bool, optional): Whether to build the nested statements of every file. Defaults to True.
+        """
+        workers = workers or os.cpu_count() or 1
+        files = [file for file in self.files.values() if file._content is None]
+        if workers == 1 or len(files) <= 1:
+            for file in files:
+                file._content = read_source(file._path)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                contents = executor.map(
+                    read_source,
+                    [file._path for file in files],
+                    chunksize=max(1, len(files) // (workers * 4)),
+                )
+                for file, content in zip(files, contents):
+                    file._content = content
+
+        for file in self.files.values():
+            _ = file.node
+            if not build_statements:
+                continue
+            stack: list[Statement] = list(file.statements)
+            while stack:
+                stat = stack.pop()
+                if isinstance(stat, BlockStatement):
+                    stack.extend(stat.statements)
+
+    @cached_property
+    def files_by_name(self) -> dict[str, list[File]]:
+        """
+        A dictionary mapping the file names, without directories, to the project files with that name.
+        """
+        files_by_name: dict[str, list[File]] = {}
+        for file in self.files.values():
+            files_by_name.setdefault(file.name, []).append(file)
+        return files_by_name
+
     @cached_property
     def files_abspath(self) -> dict[str, File]:
         """
@@ -220,6 +413,22 @@ class Project:
             functions.extend(file.functions)
         return functions
 
+    @cached_property
+    def name_resolver(self) -> NameResolver:
+        """
+        The tree-sitter-only call resolver of the project, which resolves calls by name
+        with a confidence score when no LSP server or CPG is available.
+        """
+        return NameResolver(self)
+
+    @cached_property
+    def symbol_index(self) -> SymbolIndex:
+        """
+        The index of the functions, classes and fields of the project by name, built in a process pool
+        and persisted in the :attr:`analysis_cache`. Use :class:`SymbolIndex` directly to set the number of workers.
+        """
+        return SymbolIndex(self)
+
     @cached_property
     @abstractmethod
     def entry_point(self) -> Function | None:
@@ -266,15 +475,49 @@ class Project:
         entry = self.entry_point
         if entry is None:
             return nx.MultiDiGraph()
-        if hasattr(self, "lsp"):
-            for file in self.files.values():
-                try:
-                    self.lsp.open_file(file.relpath).__enter__()
-                except Exception as e:
-                    print(f"Error preloading file {file.relpath}: {e}")
         cg = self.__build_callgraph(entry)
         return cg
 
+    def full_callgraph(self, workers: int | None = None) -> CallGraph:
+        """
+        Call graph of the whole project, with the callees of every function in :attr:`functions`.
+
+        The LSP requests resolving the callees are issued concurrently from a thread pool,
+        while parsing and building the graph stay in the current thread. With several servers
+        in the :attr:`lsp_pool`, each function is resolved by the server of its file.
+
+        Args:
+            workers (int | None, optional): The number of concurrent LSP requesters. Defaults to the number of CPUs.
+                If set to 1, callees are resolved one function at a time.
+
+        Returns:
+            CallGraph: The call graph, which converts to networkx with :meth:`CallGraph.to_networkx`.
+        """
+        workers = workers or os.cpu_count() or 1
+        functions = [
+            function for function in self.functions if not function.file.is_external
+        ]
+        pending = [
+            function
+            for function in functions
+            if cached_value(function, "callees") is None
+            and not function._has_cpg
+            and function._has_lsp
+        ]
+        if workers > 1 and len(pending) > 1:
+            # query the call statements before the requests run concurrently
+            for function in pending:
+                _ = function.lsp
+                for call_stat in function.calls:
+                    _ = call_stat.identifiers
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                locations = list(
+                    executor.map(lambda function: function._callee_locations(), pending)
+                )
+            for function, callee_locations in zip(pending, locations):
+                function._set_callee_locations(callee_locations)
+        return CallGraph({function: function.callees for function in functions})
+
     def export_callgraph(self, output_path: str):
         """
         Exports the call graph of the project to a DOT file.
@@ -307,11 +550,22 @@ class GitProject(Project):
         language: type[lang.Language],
         enable_lsp: bool = True,
         joern_config: joern.JoernConfig | None = None,
+        cache_dir: str | None = None,
+        lsp_servers: int = 1,
+        lsp_background: bool = False,
     ) -> GitProject:
         """Factory method to build a :class:`GitProject` instance."""
         if language in (lang.PHP, lang.SWIFT):
             enable_lsp = False
-        return GitProject(path, language, enable_lsp, joern_config)
+        return GitProject(
+            path,
+            language,
+            enable_lsp,
+            joern_config,
+            cache_dir,
+            lsp_servers,
+            lsp_background,
+        )
 
     def __init__(
         self,
@@ -319,6 +573,9 @@ class GitProject(Project):
         language: type[lang.Language],
         enable_lsp: bool = True,
         joern_config: joern.JoernConfig | None = None,
+        cache_dir: str | None = None,
+        lsp_servers: int = 1,
+        lsp_background: bool = False,
     ):
         """
         Initialize a GitProject.
@@ -328,11 +585,22 @@ class GitProject(Project):
             language (type[Language]): The programming language type for the project.
             enable_lsp (bool, optional): Whether to enable LSP support. Defaults to True.
             joern_config (JoernConfig | None, optional): Configuration for Joern integration.
+            cache_dir (str | None, optional): The directory of a persistent analysis cache.
+            lsp_servers (int, optional): The number of language server processes. Defaults to 1.
+            lsp_background (bool, optional): Whether to start the language servers in the background. Defaults to False.
 
         Raises:
             ValueError: If the path is not a valid Git repository.
         """
-        super().__init__(path, language, enable_lsp, joern_config)
+        super().__init__(
+            path,
+            language,
+            enable_lsp,
+            joern_config,
+            cache_dir,
+            lsp_servers,
+            lsp_background,
+        )
         try:
             self.repo = Repo(path)
         except Exception as e:
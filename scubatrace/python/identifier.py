@@ -1,4 +1,5 @@
 from ..identifier import Identifier
 
 
-class PythonIdentifier(Identifier): ...
+class PythonIdentifier(Identifier):
+    __slots__ = ()
@@ -178,3 +178,10 @@ class PYTHON(Language):
                 if child.type == "assignment":
                     return True
         return False
+
+    @classmethod
+    def receiver_offset(cls, node: Node, parameters: list[str]) -> int:
+        # the receiver of a method call is bound to self or cls
+        if node.type == "attribute" and parameters[:1] in (["self"], ["cls"]):
+            return 1
+        return 0
@@ -10,8 +10,19 @@ class PythonProject(Project):
         path: str,
         enable_lsp: bool = True,
         joern_config: joern.JoernConfig | None = None,
+        cache_dir: str | None = None,
+        lsp_servers: int = 1,
+        lsp_background: bool = False,
     ):
-        super().__init__(path, language.PYTHON, enable_lsp, joern_config)
+        super().__init__(
+            path,
+            language.PYTHON,
+            enable_lsp,
+            joern_config,
+            cache_dir,
+            lsp_servers,
+            lsp_background,
+        )
         self._parser = PythonParser()
 
     @property
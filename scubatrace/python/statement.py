@@ -1,13 +1,12 @@
 from __future__ import annotations
 
-from functools import cached_property
-
 from ..identifier import Identifier
+from ..slots import slot_cached_property
 from ..statement import BlockStatement, SimpleStatement, Statement
 
 
 class PythonSimpleStatement(SimpleStatement):
-    @cached_property
+    @slot_cached_property
     def right_uncle_ancestor(self) -> Statement | None:
         """
         Returns the right uncle ancestor of the statement.
@@ -32,7 +31,7 @@ class PythonSimpleStatement(SimpleStatement):
             cur = cur.parent
         return None
 
-    @cached_property
+    @slot_cached_property
     def variables(self) -> list[Identifier]:
         """
         Variables in the statement.
@@ -58,7 +57,7 @@ class PythonSimpleStatement(SimpleStatement):
 
 
 class PythonBlockStatement(BlockStatement):
-    @cached_property
+    @slot_cached_property
     def right_uncle_ancestor(self) -> Statement | None:
         """
         Returns the right uncle ancestor of the statement.
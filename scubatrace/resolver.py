@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import os
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+from tree_sitter import Node
+
+from .function import DummyFunction, Function
+from .statement import innermost_statement
+
+if TYPE_CHECKING:
+    from .file import File
+    from .project import Project
+    from .statement import Statement
+
+
+@dataclass(frozen=True)
+class ResolvedCall:
+    """
+    A call site resolved by name, with the confidence of the resolution.
+    """
+
+    caller: Function
+    callee: Function | DummyFunction
+    call_site: Statement
+    confidence: float
+    """
+    From 0 to 1: 1 for the only candidate in scope with a matching arity, split between equally likely candidates,
+    and 0 for a call that no function of the project matches, whose callee is a :class:`DummyFunction`.
+    """
+
+
+class NameResolver:
+    """
+    Resolves the calls of a project by name with tree-sitter only, without an LSP server or a CPG.
+
+    The functions of the project are indexed by name. A call is matched to the functions of its name,
+    which are scored by scope, the file of the call first, then the files it imports, then the rest of
+    the project, and by whether their parameters match the number of arguments. The best scored
+    candidates share the confidence of the resolution.
+    """
+
+    SAME_FILE = 1.0
+    """The score of a candidate in the file of the call."""
+
+    IMPORTED = 0.8
+    """The score of a candidate in a file imported by the file of the call."""
+
+    ELSEWHERE = 0.4
+    """The score of a candidate elsewhere in the project."""
+
+    ARITY_MISMATCH = 0.5
+    """The factor of a candidate whose parameters do not match the arguments of the call."""
+
+    def __init__(self, project: Project):
+        self.project = project
+        self._imports: dict[File, set[str]] = {}
+
+    @cached_property
+    def symbols(self) -> dict[str, list[Function]]:
+        """
+        The functions of the project by name.
+        """
+        symbols = defaultdict(list)
+        for function in self.project.functions:
+            symbols[function.name].append(function)
+        return dict(symbols)
+
+    def _imported_names(self, file: File) -> set[str]:
+        """
+        The module or file names imported by a file, without directories and extensions.
+        """
+        names = self._imports.get(file)
+        if names is not None:
+            return names
+        names = set()
+        nodes = file.parser.query_by_capture_name(
+            file.node, file.language.query_import_identifier, "name"
+        )
+        for node in nodes:
+            if node.text is None:
+                continue
+            name = os.path.basename(node.text.decode().strip("\"'<>"))
+            stem, _, extension = name.rpartition(".")
+            if stem and extension in file.language.extensions + ["json"]:
+                name = stem
+            names.add(name.rsplit(".", 1)[-1])
+        self._imports[file] = names
+        return names
+
+    @staticmethod
+    def _call_name(call: Node) -> str | None:
+        target = (
+            call.child_by_field_name("function")
+            or call.child_by_field_name("name")
+            or call.child_by_field_name("method")
+            or call.child_by_field_name("macro")
+        )
+        if target is None or target.text is None:
+            return None
+        names = re.findall(r"\w+", target.text.decode())
+        return names[-1] if names else None
+
+    @staticmethod
+    def _call_arity(call: Node) -> int | None:
+        arguments = call.child_by_field_name("arguments")
+        if arguments is None:
+            return None
+        return len([arg for arg in arguments.named_children if arg.type != "comment"])
+
+    def _score(self, caller: Function, candidate: Function, call: Node) -> float:
+        file = caller.file
+        if candidate.file == file:
+            score = self.SAME_FILE
+        elif candidate.file.name.rsplit(".", 1)[0] in self._imported_names(file):
+            score = self.IMPORTED
+        else:
+            score = self.ELSEWHERE
+        arity = self._call_arity(call)
+        parameters = [parameter.text for parameter in candidate.parameters]
+        if parameters[:1] in (["self"], ["cls"]):
+            parameters = parameters[1:]
+        if arity is not None and arity != len(parameters):
+            score *= self.ARITY_MISMATCH
+        return score
+
+    def resolve(self, caller: Function, call: Node) -> list[ResolvedCall]:
+        """
+        Resolves a call node of a function to the functions of the project it most likely calls.
+
+        Args:
+            caller (Function): The function the call is in.
+            call (Node): A node matched by the call query of the language.
+
+        Returns:
+            list[ResolvedCall]: The best scored candidates, or a call to a :class:`DummyFunction`
+                if no function of the project has the name of the call.
+        """
+        name = self._call_name(call)
+        if name is None:
+            return []
+        call_site = (
+            innermost_statement(caller.statements, caller._byte_spans, call) or caller
+        )
+        candidates = [
+            candidate
+            for candidate in self.symbols.get(name, [])
+            if candidate != caller  # avoid self-references
+        ]
+        if not candidates:
+            if name in self.symbols:
+                return []
+            return [ResolvedCall(caller, DummyFunction(name), call_site, 0.0)]
+        scores = [self._score(caller, candidate, call) for candidate in candidates]
+        best = max(scores)
+        bests = [c for c, score in zip(candidates, scores) if score == best]
+        return [
+            ResolvedCall(caller, callee, call_site, best / len(bests))
+            for callee in bests
+        ]
+
+    def calls(self, function: Function) -> list[ResolvedCall]:
+        """
+        The resolved calls of a function, in source order.
+
+        Args:
+            function (Function): The calling function.
+
+        Returns:
+            list[ResolvedCall]: The calls of the function to the functions it most likely calls.
+        """
+        nodes = function.file.parser.query_all(
+            function.node, function.language.query_call
+        )
+        return [call for node in nodes for call in self.resolve(function, node)]
+
+    @cached_property
+    def _callers(self) -> dict[Function, list[ResolvedCall]]:
+        callers = defaultdict(list)
+        for function in self.project.functions:
+            for call in self.calls(function):
+                if isinstance(call.callee, Function):
+                    callers[call.callee].append(call)
+        return dict(callers)
+
+    def callers(self, function: Function) -> list[ResolvedCall]:
+        """
+        The resolved calls to a function from the whole project.
+
+        Args:
+            function (Function): The called function.
+
+        Returns:
+            list[ResolvedCall]: The calls that most likely call the function.
+        """
+        return self._callers.get(function, [])
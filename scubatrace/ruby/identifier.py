@@ -1,4 +1,5 @@
 from ..identifier import Identifier
 
 
-class RubyIdentifier(Identifier): ...
+class RubyIdentifier(Identifier):
+    __slots__ = ()
@@ -1,4 +1,5 @@
 from ..identifier import Identifier
 
 
-class RustIdentifier(Identifier): ...
+class RustIdentifier(Identifier):
+    __slots__ = ()
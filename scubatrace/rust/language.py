@@ -1,5 +1,8 @@
+import re
+
 import tree_sitter_rust as tsrust
 from tree_sitter import Language as TSLanguage
+from tree_sitter import Node
 
 from ..language import Language
 
@@ -16,6 +19,7 @@ class RUST(Language):
         (use_declaration
         	argument: (scoped_identifier
             	name: (identifier)@name
+            )
         )
     """
 
@@ -109,3 +113,9 @@ class RUST(Language):
                 (#eq? @left "{text}")
             )
         """
+
+    @classmethod
+    def call_target_name(cls, node: Node) -> str:
+        # macro invocations are named with a trailing "!", like println!
+        assert node.text is not None
+        return re.split(r"\W+", node.text.decode().rstrip("!"))[-1]
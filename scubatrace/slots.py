@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class slot_cached_property(Generic[T]):
+    """
+    A :func:`functools.cached_property` for classes with ``__slots__``.
+
+    The computed value is stored in the slot named after the property with a leading underscore,
+    which must be declared in the ``__slots__`` of the class, e.g. ``_key`` for a ``key`` property.
+    Private properties use a trailing underscore instead, e.g. ``_spans_`` for a ``_spans`` property,
+    as slots with two leading underscores are name-mangled. Subclasses overriding the property share
+    the slot of the base class. Deleting the attribute clears the cached value, like with
+    :func:`functools.cached_property`.
+    """
+
+    def __init__(self, func: Callable[[Any], T]):
+        self.func = func
+        self.__doc__ = func.__doc__
+        self.__module__ = func.__module__
+        self.__isabstractmethod__ = getattr(func, "__isabstractmethod__", False)
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+        self.slot = getattr(owner, name + "_" if name.startswith("_") else "_" + name)
+
+    def __get__(self, instance: Any, owner: type | None = None) -> T:
+        if instance is None:
+            return self  # type: ignore
+        try:
+            return self.slot.__get__(instance, owner)
+        except AttributeError:
+            value = self.func(instance)
+            self.slot.__set__(instance, value)
+            return value
+
+    def __set__(self, instance: Any, value: T):
+        self.slot.__set__(instance, value)
+
+    def __delete__(self, instance: Any):
+        self.slot.__delete__(instance)
+
+    def is_cached(self, instance: Any) -> bool:
+        """
+        Checks if the value of the property is cached on the instance.
+        """
+        try:
+            self.slot.__get__(instance, type(instance))
+        except AttributeError:
+            return False
+        return True
+
+
+def cached_value(obj: Any, name: str, default: Any = None) -> Any:
+    """
+    The cached value of a :class:`slot_cached_property` or :func:`functools.cached_property` of an object,
+    without computing it.
+
+    Args:
+        obj (Any): The object owning the property.
+        name (str): The name of the property.
+        default (Any): The value returned if the property is not cached.
+
+    Returns:
+        Any: The cached value, or the default.
+    """
+    attr = getattr(type(obj), name, None)
+    if isinstance(attr, slot_cached_property):
+        return attr.__get__(obj) if attr.is_cached(obj) else default
+    return getattr(obj, "__dict__", {}).get(name, default)
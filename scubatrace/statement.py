@@ -1,47 +1,160 @@
 from __future__ import annotations
 
 from abc import abstractmethod
+from bisect import bisect_left, bisect_right
 from collections import defaultdict, deque
-from functools import cached_property
 from typing import TYPE_CHECKING, Callable, Generator
 
 from tree_sitter import Node
 
 from . import language as lang
-from .identifier import Identifier
+from .identifier import Identifier, IdentifierIndex
 from .language import Language
+from .slots import slot_cached_property
 
 if TYPE_CHECKING:
     from .clazz import Class
+    from .dataflow import ControlFlowGraph
     from .file import File
     from .function import Function
     from .project import Project
 
 
+def line_spans(statements: list) -> tuple[list[int], list[int]]:
+    """
+    The start and end lines of sibling statements, in source order.
+
+    Sibling statements never overlap, so both lists are sorted.
+
+    Args:
+        statements (list): The sibling statements.
+
+    Returns:
+        tuple[list[int], list[int]]: The start lines and the end lines of the statements.
+    """
+    start_lines = [stat.node.start_point[0] + 1 for stat in statements]
+    end_lines = [stat.node.end_point[0] + 1 for stat in statements]
+    return start_lines, end_lines
+
+
+def statements_spanning_line(
+    statements: list, spans: tuple[list[int], list[int]], line: int
+) -> list:
+    """
+    The sibling statements that span the specified line number, found by binary search.
+
+    Args:
+        statements (list): The sibling statements.
+        spans (tuple[list[int], list[int]]): The :func:`line_spans` of the statements.
+        line (int): The line number to check.
+
+    Returns:
+        list: The statements whose start and end lines enclose the line.
+    """
+    start_lines, end_lines = spans
+    return statements[bisect_left(end_lines, line) : bisect_right(start_lines, line)]
+
+
+def byte_spans(statements: list) -> tuple[list[int], list[int]]:
+    """
+    The start and end bytes of sibling statements, in source order.
+
+    Args:
+        statements (list): The sibling statements.
+
+    Returns:
+        tuple[list[int], list[int]]: The start bytes and the end bytes of the statements.
+    """
+    start_bytes = [stat.node.start_byte for stat in statements]
+    end_bytes = [stat.node.end_byte for stat in statements]
+    return start_bytes, end_bytes
+
+
+def innermost_statement(
+    statements: list, spans: tuple[list[int], list[int]], node: Node
+) -> Statement | None:
+    """
+    The innermost statement that contains the node, found by binary search over sibling byte spans.
+
+    Only the sub-statements along the path to the node are built.
+
+    Args:
+        statements (list): The sibling statements to search in.
+        spans (tuple[list[int], list[int]]): The :func:`byte_spans` of the statements.
+        node (Node): The tree-sitter node to locate.
+
+    Returns:
+        Statement | None: The innermost statement containing the node, or None if no statement contains it.
+    """
+    found = None
+    while True:
+        start_bytes, end_bytes = spans
+        index = bisect_right(start_bytes, node.start_byte) - 1
+        if index < 0 or end_bytes[index] < node.end_byte:
+            return found
+        found = statements[index]
+        if not isinstance(found, BlockStatement):
+            return found
+        statements, spans = found.statements, found._byte_spans
+
+
 class Statement:
     """
     A statement in the source code.
     """
 
+    # the cached properties are stored in slots, the __dict__ holds those of subclasses such as Function
+    __slots__ = (
+        "__dict__",
+        "_arguments_",
+        "_function",
+        "_identifier_index_",
+        "_identifiers",
+        "_key",
+        "_left_values_",
+        "_next_sibling",
+        "_post_controls",
+        "_preorder_successor",
+        "_prev_sibling",
+        "_right_uncle_ancestor",
+        "_variable_index_",
+        "_variables",
+        "node",
+        "parent",
+    )
+
     node: Node
     """ The tree-sitter node representing this statement. """
 
     parent: BlockStatement | Function | File
     """ The parent block or function or file this statement belongs to. """
 
+    # the post-control statements restored from the analysis cache, consumed by the control flow graph
+    _post_controls: list[Statement]
+
     def __init__(self, node: Node, parent: BlockStatement | Function | File):
         self.node = node
         self.parent = parent
-        self._pre_control_statements = []
 
     def __str__(self) -> str:
         return f"{self.signature}: {self.text}"
 
     def __eq__(self, value: object) -> bool:
-        return isinstance(value, Statement) and self.signature == value.signature
+        return isinstance(value, Statement) and self.key == value.key
 
     def __hash__(self):
-        return hash(self.signature)
+        return hash(self.key)
+
+    @slot_cached_property
+    def key(self) -> tuple[int, int, int, str]:
+        """
+        A compact key that identifies the statement, used for hashing and equality.
+
+        It consists of the :attr:`File.file_id`, the byte range and the tree-sitter type of the statement,
+        and is computed once. Use :attr:`signature` for display.
+        """
+        node = self.node
+        return (self.file.file_id, node.start_byte, node.end_byte, node.type)
 
     @property
     def project(self) -> Project:
@@ -95,7 +208,7 @@ class Statement:
     def lsp(self):
         return self.file.lsp
 
-    @cached_property
+    @slot_cached_property
     def identifiers(self) -> list[Identifier]:
         """
         Identifiers in the statement.
@@ -116,7 +229,7 @@ class Statement:
             identifiers |= identifiers_in_children
         return sorted(identifiers, key=lambda x: (x.start_line, x.start_column))
 
-    @cached_property
+    @slot_cached_property
     def variables(self) -> list[Identifier]:
         """
         Variables in the statement.
@@ -150,13 +263,31 @@ class Statement:
         Returns:
             Identifier | None: The identifier at the specified position, or None if not found.
         """
-        for identifier in self.identifiers:
-            if (
-                identifier.start_line == line
-                and identifier.start_column <= column <= identifier.end_column
-            ):
-                return identifier
-        return None
+        return self._identifier_index.at(line, column)
+
+    @slot_cached_property
+    def _identifier_index(self) -> IdentifierIndex:
+        return IdentifierIndex(self.identifiers)
+
+    @slot_cached_property
+    def _variable_index(self) -> IdentifierIndex:
+        return IdentifierIndex(self.variables)
+
+    @slot_cached_property
+    def _left_values(self) -> set[tuple[tuple[int, int], str]]:
+        """
+        The start points and texts of the left values in the statement, found in one query.
+        """
+        nodes = self.file.parser.query_all(self.node, self.language.query_left_values())
+        return {(node.start_point, node.text.decode()) for node in nodes if node.text}
+
+    @slot_cached_property
+    def _arguments(self) -> set[tuple[int, int]]:
+        """
+        The start points of the function call arguments in the statement, found in one query.
+        """
+        nodes = self.file.parser.query_all(self.node, self.language.query_argument)
+        return {node.start_point for node in nodes}
 
     @property
     def right_values(self) -> list[Identifier]:
@@ -259,7 +390,7 @@ class Statement:
             return self.parent
         return self.parent.file
 
-    @cached_property
+    @slot_cached_property
     def function(self) -> Function | None:
         """
         The function this statement belongs to, if any.
@@ -277,7 +408,7 @@ class Statement:
                 return None
         return cur
 
-    @cached_property
+    @slot_cached_property
     def prev_sibling(self) -> Statement | None:
         """
         The previous sibling statement in the same block.
@@ -290,7 +421,7 @@ class Statement:
             return None
         return parent_statements[index - 1]
 
-    @cached_property
+    @slot_cached_property
     def next_sibling(self) -> Statement | None:
         """
         The next sibling statement in the same block.
@@ -303,7 +434,7 @@ class Statement:
             return None
         return parent_statements[index + 1]
 
-    @cached_property
+    @slot_cached_property
     def right_uncle_ancestor(self) -> Statement | None:
         """
         The right uncle ancestor of the statement.
@@ -325,7 +456,7 @@ class Statement:
             cur = cur.parent
         return None
 
-    @cached_property
+    @slot_cached_property
     def preorder_successor(self) -> Statement | None:
         """
         The preorder successor of the statement.
@@ -338,15 +469,43 @@ class Statement:
             return next_sibling
         return self.right_uncle_ancestor
 
-    @cached_property
     @abstractmethod
+    def _build_post_controls(self) -> list[Statement]:
+        """
+        Computes the post-control statements of the statement from its place in the AST.
+
+        This is called once per statement when the control flow graph containing it is built.
+        """
+        ...
+
+    @property
+    def _control_flow_parent(self) -> Function | File:
+        """
+        The function or file whose control flow graph the statement is a node of.
+
+        That is the innermost function containing the statement, other than itself,
+        or the file for statements outside functions.
+        """
+        function = self.function
+        if function is self:
+            parent = self.parent
+            function = parent.function if isinstance(parent, Statement) else None
+        if function is None:
+            return self.file
+        return function
+
+    @property
+    def _control_flow_graph(self) -> ControlFlowGraph:
+        return self._control_flow_parent.control_flow_graph
+
+    @property
     def post_controls(self) -> list[Statement]:
         """
         Post-control statements of the statement.
 
         These are statements that are executed after this statement in the control flow.
         """
-        ...
+        return self._control_flow_graph.post_controls(self)
 
     @property
     def pre_controls(self) -> list[Statement]:
@@ -355,19 +514,16 @@ class Statement:
 
         These are statements that are executed before this statement in the control flow.
         """
-        if self.function is not None:
-            if not self.function._is_build_cfg:
-                self.function.build_cfg()
-        else:
-            if not self.file._is_build_cfg:
-                self.file.build_cfg()
-        return self._pre_control_statements
+        return self._control_flow_graph.pre_controls(self)
 
     @property
     def post_control_dependents(self) -> list[Statement]:
         """
         Statements that are dependent on this statement in the control flow.
         """
+        function = self.function
+        if function is not None and self in function.control_flow_graph:
+            return function.control_dependence_graph.dependents(self)
         if isinstance(self, SimpleStatement):
             return []
         assert isinstance(self, BlockStatement)
@@ -384,6 +540,9 @@ class Statement:
         """
         Statements that are dependent on this statement in the control flow before it.
         """
+        function = self.function
+        if function is not None and self in function.control_flow_graph:
+            return function.control_dependence_graph.controllers(self)
         parent = self.parent
         from .function import Function
 
@@ -466,32 +625,15 @@ class Statement:
             defs[var] = sorted(def_vars_stats, key=lambda x: x.start_line)
         return defs
 
-    @cached_property
+    @property
     def is_taint_from_entry(self) -> bool:
         """
         Checks if the variables of the statement are tainted from the parameters of the function.
         """
-        refs: dict[Identifier, list[Statement]] = self.references
-        backword_refs: dict[Identifier, list[Statement]] = defaultdict(list)
-        for var, statements in refs.items():
-            for stat in statements:
-                if stat.start_line < self.start_line:
-                    backword_refs[var].append(stat)
-        if len(backword_refs) == 0:
+        function = self.function
+        if function is None:
             return False
-
-        from .function import Function
-
-        for var, statements in backword_refs.items():
-            for stat in statements:
-                if isinstance(stat, Function):
-                    return True
-                for stat_var in stat.variables:
-                    if stat_var.text != var.text:
-                        continue
-                    if stat_var.is_left_value and stat.is_taint_from_entry:
-                        return True
-        return False
+        return function.taint_analysis.is_statement_tainted(self)
 
     def walk_backward(
         self,
@@ -705,8 +847,7 @@ class SimpleStatement(Statement):
     def is_jump_statement(self) -> bool:
         return self.node_type in self.language.JUMP_STATEMENTS
 
-    @cached_property
-    def post_controls(self) -> list[Statement]:
+    def _build_post_controls(self) -> list[Statement]:
         if self.node_type in self.language.EXIT_STATEMENTS:
             return []
         if self.node_type in self.language.CONTINUE_STATEMENTS:
@@ -750,6 +891,14 @@ class SimpleStatement(Statement):
 
 
 class BlockStatement(Statement):
+    __slots__ = (
+        "_block_identifiers",
+        "_block_variables",
+        "_byte_spans_",
+        "_line_spans_",
+        "_statements",
+    )
+
     @staticmethod
     def create(node: Node, parent: BlockStatement | Function | File):
         """
@@ -813,14 +962,22 @@ class BlockStatement(Statement):
     def dot_text(self) -> str:
         return '"' + self.text.split("\n")[0].replace('"', '\\"') + '..."'
 
-    @cached_property
+    @slot_cached_property
     def statements(self) -> list[Statement]:
         """
         Sub-statements of the block.
         """
         return BlockStatement.build_statements(self.node, self)
 
-    @cached_property
+    @slot_cached_property
+    def _line_spans(self) -> tuple[list[int], list[int]]:
+        return line_spans(self.statements)
+
+    @slot_cached_property
+    def _byte_spans(self) -> tuple[list[int], list[int]]:
+        return byte_spans(self.statements)
+
+    @slot_cached_property
     def block_identifiers(self) -> list[Identifier]:
         """
         Identifiers declared directly in the block.
@@ -837,7 +994,7 @@ class BlockStatement(Statement):
             identifiers_in_children.update(stat.identifiers)
         return list(identifiers - identifiers_in_children)
 
-    @cached_property
+    @slot_cached_property
     def block_variables(self) -> list[Identifier]:
         """
         Variables declared directly in the block.
@@ -872,8 +1029,7 @@ class BlockStatement(Statement):
                 return True
         return False
 
-    @cached_property
-    def post_controls(self) -> list[Statement]:
+    def _build_post_controls(self) -> list[Statement]:
         if self.node_type in self.language.IF_STATEMENTS:
             consequences = self.statements_by_field_name("consequence")
             alternatives = self.statements_by_field_name("alternative")
@@ -959,15 +1115,14 @@ class BlockStatement(Statement):
             list[Statement]: A list of statements that are located on the specified line.
         """
         targets = []
-        for stat in self.statements:
-            if stat.start_line <= line <= stat.end_line:
-                if isinstance(stat, BlockStatement):
-                    sub_targets = stat.statements_by_line(line)
-                    targets.extend(sub_targets)
-                    if len(sub_targets) == 0:
-                        targets.append(stat)
-                elif isinstance(stat, SimpleStatement):
+        for stat in statements_spanning_line(self.statements, self._line_spans, line):
+            if isinstance(stat, BlockStatement):
+                sub_targets = stat.statements_by_line(line)
+                targets.extend(sub_targets)
+                if len(sub_targets) == 0:
                     targets.append(stat)
+            elif isinstance(stat, SimpleStatement):
+                targets.append(stat)
         if len(targets) == 0:
             if self.start_line <= line <= self.end_line:
                 targets.append(self)
@@ -1047,7 +1202,12 @@ class BlockStatement(Statement):
         Returns:
             list[Statement]: A list of statements that match the query.
         """
-        return self.file.query(query, self.node)
+        matched_nodes = self.file.parser.query_all(self.node, query)
+        matched_statements = [
+            innermost_statement(self.statements, self._byte_spans, node) or self
+            for node in matched_nodes
+        ]
+        return list(dict.fromkeys(matched_statements))
 
     def query_oneshot(self, query: str) -> Statement | None:
         """
@@ -1074,7 +1234,8 @@ class BlockStatement(Statement):
         Returns:
             list[Identifier]: A list of identifiers that match the query.
         """
-        return self.file.query_identifiers(query, self.node)
+        matched_nodes = self.file.parser.query_all(self.node, query)
+        return self._identifier_index.within(matched_nodes)
 
     def query_identifier(self, query: str) -> Identifier | None:
         """
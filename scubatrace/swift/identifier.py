@@ -1,4 +1,5 @@
 from ..identifier import Identifier
 
 
-class SwiftIdentifier(Identifier): ...
+class SwiftIdentifier(Identifier):
+    __slots__ = ()
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import difflib
+import os
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from .clazz import Class
+from .function import Function
+
+if TYPE_CHECKING:
+    from . import language as lang
+    from .field import Field
+    from .file import File
+    from .project import Project
+
+
+@dataclass(frozen=True)
+class Symbol:
+    """
+    A function, class or field of a project, as recorded in its :class:`SymbolIndex`.
+    """
+
+    name: str
+    qualified_name: str
+    """The name prefixed with the names of the enclosing classes and functions, separated by dots."""
+
+    kind: str
+    """The kind of the symbol: ``"function"``, ``"class"`` or ``"field"``."""
+
+    file: str
+    """The relative path of the file of the symbol in the project."""
+
+    start_byte: int
+    end_byte: int
+    start_line: int
+
+
+def _qualified_name(entity: Function | Class, name: str) -> str:
+    names = [name]
+    parent = entity.parent
+    while isinstance(parent, (Function, Class)):
+        names.append(parent.name)
+        parent = parent.parent
+    return ".".join(reversed(names))
+
+
+def _file_symbols(file: File) -> list[list[Any]]:
+    """
+    The symbol records of a file: name, qualified name, kind, start byte, end byte and start line.
+    """
+    records = []
+    for kind, entities in (("function", file.functions), ("class", file.classes)):
+        for entity in entities:
+            try:
+                name = entity.name
+            except (ValueError, AssertionError):
+                continue
+            node = entity.node
+            qualified_name = _qualified_name(entity, name)
+            records.append(
+                [
+                    name,
+                    qualified_name,
+                    kind,
+                    node.start_byte,
+                    node.end_byte,
+                    entity.start_line,
+                ]
+            )
+            if kind != "class":
+                continue
+            for field in entity.fields:  # type: ignore
+                try:
+                    field_name = field.name
+                except (ValueError, AssertionError):
+                    continue
+                node = field.node
+                records.append(
+                    [
+                        field_name,
+                        f"{qualified_name}.{field_name}",
+                        "field",
+                        node.start_byte,
+                        node.end_byte,
+                        node.start_point[0] + 1,
+                    ]
+                )
+    return records
+
+
+_worker_project: Project | None = None
+
+
+def _init_worker(path: str, language: type[lang.Language]):
+    global _worker_project
+    from .project import Project
+
+    _worker_project = Project.create(path, language, enable_lsp=False)
+
+
+def _index_file(relpath: str) -> list[list[Any]]:
+    assert _worker_project is not None
+    return _file_symbols(_worker_project.files[relpath])
+
+
+class SymbolIndex:
+    """
+    An index of the functions, classes and fields of a project by name and qualified name.
+
+    The symbols of each file are recorded once, in a process pool for the files not parsed nor edited yet,
+    and persisted in the :class:`AnalysisCache` of the project when it has one, so that later runs
+    load the index without parsing. Lookups return :class:`Symbol` records, whose entities are
+    built on demand with :meth:`entity`.
+    """
+
+    project: Project
+    """The indexed project."""
+
+    def __init__(self, project: Project, workers: int | None = None):
+        """
+        Indexes the symbols of the project.
+
+        Args:
+            project (Project): The project to index.
+            workers (int | None, optional): The number of worker processes parsing the files.
+                Defaults to the number of CPUs. If set to 1, files are parsed in the current process.
+        """
+        self.project = project
+        self._files: dict[str, list[Symbol]] = {}
+        self._stale: set[str] = set()
+        cache = project.analysis_cache
+        pending = []
+        for relpath, file in project.files.items():
+            records = cache.get_symbols(file) if cache is not None else None
+            if records is not None:
+                self._add(relpath, records)
+            elif file.is_modified or "tree" in file.__dict__:
+                # workers read the files from disk, so edited and parsed files are indexed here
+                self._index(relpath)
+            else:
+                pending.append(relpath)
+
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(pending) <= 1:
+            for relpath in pending:
+                self._index(relpath)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(project.path, project.language),
+            ) as executor:
+                results = executor.map(
+                    _index_file,
+                    pending,
+                    chunksize=max(1, len(pending) // (workers * 4)),
+                )
+                for relpath, records in zip(pending, results):
+                    self._add(relpath, records)
+                    if cache is not None:
+                        cache.put_symbols(project.files[relpath], records)
+        self._build()
+
+    def _index(self, relpath: str):
+        file = self.project.files[relpath]
+        records = _file_symbols(file)
+        self._add(relpath, records)
+        cache = self.project.analysis_cache
+        if cache is not None:
+            cache.put_symbols(file, records)
+
+    def _add(self, relpath: str, records: list[list[Any]]):
+        self._files[relpath] = [
+            Symbol(r[0], r[1], r[2], relpath, *r[3:]) for r in records
+        ]
+
+    def _build(self):
+        by_name: dict[str, list[Symbol]] = {}
+        for symbols in self._files.values():
+            for symbol in symbols:
+                by_name.setdefault(symbol.name, []).append(symbol)
+                if symbol.qualified_name != symbol.name:
+                    by_name.setdefault(symbol.qualified_name, []).append(symbol)
+        self._by_name = by_name
+        self._names = sorted(by_name)
+
+    def _refresh(self):
+        if not self._stale:
+            return
+        for relpath in self._stale:
+            self._files.pop(relpath, None)
+            if relpath in self.project.files:
+                self._index(relpath)
+        self._stale.clear()
+        self._build()
+
+    def invalidate(self, file: File):
+        """
+        Marks the symbols of a file as outdated, to index it again on the next lookup.
+
+        Args:
+            file (File): The changed file.
+        """
+        self._stale.add(file.relpath)
+
+    def __len__(self) -> int:
+        self._refresh()
+        return sum(len(symbols) for symbols in self._files.values())
+
+    def lookup(self, name: str, kind: str | None = None) -> list[Symbol]:
+        """
+        The symbols with a name or qualified name.
+
+        Args:
+            name (str): The name or qualified name, such as ``"Car.start_engine"``.
+            kind (str | None): Only return the symbols of this kind, if given.
+
+        Returns:
+            list[Symbol]: The matching symbols.
+        """
+        self._refresh()
+        symbols = self._by_name.get(name, [])
+        return [s for s in symbols if kind is None or s.kind == kind]
+
+    def prefix(self, prefix: str, kind: str | None = None) -> list[Symbol]:
+        """
+        The symbols whose name or qualified name starts with a prefix.
+
+        Args:
+            prefix (str): The prefix of the names.
+            kind (str | None): Only return the symbols of this kind, if given.
+
+        Returns:
+            list[Symbol]: The matching symbols, ordered by name.
+        """
+        self._refresh()
+        symbols: dict[Symbol, None] = {}
+        i = bisect_left(self._names, prefix)
+        while i < len(self._names) and self._names[i].startswith(prefix):
+            for symbol in self._by_name[self._names[i]]:
+                if kind is None or symbol.kind == kind:
+                    symbols[symbol] = None
+            i += 1
+        return list(symbols)
+
+    def fuzzy(
+        self,
+        name: str,
+        kind: str | None = None,
+        limit: int = 10,
+        cutoff: float = 0.6,
+    ) -> list[Symbol]:
+        """
+        The symbols whose name or qualified name is similar to a name, such as a misspelled one.
+
+        Args:
+            name (str): The name to match.
+            kind (str | None): Only return the symbols of this kind, if given.
+            limit (int): The maximum number of names to match.
+            cutoff (float): The minimum similarity ratio of the names, from 0 to 1.
+
+        Returns:
+            list[Symbol]: The matching symbols, the most similar names first.
+        """
+        self._refresh()
+        symbols: dict[Symbol, None] = {}
+        for match in difflib.get_close_matches(name, self._names, limit, cutoff):
+            for symbol in self._by_name[match]:
+                if kind is None or symbol.kind == kind:
+                    symbols[symbol] = None
+        return list(symbols)
+
+    def entity(self, symbol: Symbol) -> Function | Class | Field | None:
+        """
+        The function, class or field of a symbol, parsing its file if needed.
+
+        Args:
+            symbol (Symbol): A symbol of the index.
+
+        Returns:
+            Function | Class | Field | None: The entity, or None if its file changed since it was indexed.
+        """
+        file = self.project.files.get(symbol.file)
+        if file is None:
+            return None
+        if symbol.kind == "function":
+            entities: list[Any] = file.functions
+        elif symbol.kind == "class":
+            entities = file.classes
+        else:
+            entities = [field for clazz in file.classes for field in clazz.fields]
+        for entity in entities:
+            node = entity.node
+            if (
+                node.start_byte == symbol.start_byte
+                and node.end_byte == symbol.end_byte
+            ):
+                return entity
+        return None
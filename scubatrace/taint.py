@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from collections import defaultdict, deque
+from typing import TYPE_CHECKING, Callable
+
+from .dataflow import statement_variables
+
+if TYPE_CHECKING:
+    from .function import Function
+    from .identifier import Identifier
+    from .statement import Statement
+
+
+class TaintAnalysis:
+    """
+    Taint propagation over the def-use chains of a function, solved with a worklist until a fixpoint.
+
+    Taint enters at the source identifiers, by default the parameters of the function. A statement
+    using a tainted value taints every variable it defines, unless it is a sanitizer. The taint of each
+    definition is kept as one bit of a Python integer, from which the taint of any identifier of the function
+    is read, so one analysis answers all the queries on the function.
+    """
+
+    function: Function
+    """The analyzed function."""
+
+    sources: Callable[[Identifier], bool]
+    """Whether an identifier introduces taint."""
+
+    sanitizers: Callable[[Statement], bool] | None
+    """Whether a statement sanitizes the values it defines."""
+
+    sinks: Callable[[Identifier], bool] | None
+    """Whether an identifier is a sink that must not receive taint."""
+
+    def __init__(
+        self,
+        function: Function,
+        sources: Callable[[Identifier], bool] | None = None,
+        sanitizers: Callable[[Statement], bool] | None = None,
+        sinks: Callable[[Identifier], bool] | None = None,
+    ):
+        """
+        Propagates the taint of the sources through the function.
+
+        Args:
+            function (Function): The function to analyze.
+            sources (Callable[[Identifier], bool] | None): Whether an identifier introduces taint.
+                Defaults to the parameters of the function.
+            sanitizers (Callable[[Statement], bool] | None): Whether a statement sanitizes the values it defines.
+            sinks (Callable[[Identifier], bool] | None): Whether an identifier is a sink, reported by :attr:`findings`.
+        """
+        self.function = function
+        if sources is None:
+            parameters = set(function.parameters)
+            sources = parameters.__contains__
+        self.sources = sources
+        self.sanitizers = sanitizers
+        self.sinks = sinks
+        self.definitions = function.reaching_definitions
+        self.graph = self.definitions.graph
+        self._source_uses: set[Identifier] = set()
+        self._tainted = 0
+        self._solve()
+
+    def _solve(self):
+        definitions = self.definitions
+        worklist: deque[int] = deque()
+
+        def taint(d: int):
+            if not self._tainted >> d & 1:
+                self._tainted |= 1 << d
+                worklist.append(d)
+
+        sanitized = [
+            self.sanitizers is not None and self.sanitizers(stat)
+            for stat in self.graph.statements
+        ]
+        users: dict[int, list[int]] = defaultdict(list)
+        for i, uses in enumerate(definitions._stat_uses):
+            for name, vars in uses.items():
+                for d in definitions._reaching(i, name):
+                    users[d].append(i)
+                sources = [var for var in vars if self.sources(var)]
+                self._source_uses.update(sources)
+                if sources and not sanitized[i]:
+                    for d in definitions._stat_defs[i].values():
+                        taint(d)
+            for d in definitions._stat_defs[i].values():
+                if any(self.sources(var) for var in definitions._defs[d]):
+                    taint(d)
+
+        while worklist:
+            d = worklist.popleft()
+            for i in users.get(d, []):
+                if sanitized[i]:
+                    continue
+                for defined in definitions._stat_defs[i].values():
+                    taint(defined)
+
+    def is_tainted(self, identifier: Identifier) -> bool:
+        """
+        Checks if an identifier of the function carries taint.
+
+        Args:
+            identifier (Identifier): An identifier of a statement in the function.
+
+        Returns:
+            bool: True if the value defined or used by the identifier is tainted.
+        """
+        stat = identifier.statement
+        if stat not in self.graph:
+            return False
+        i = self.graph.index(stat)
+        name = identifier.text
+        d = self.definitions._stat_defs[i].get(name)
+        if d is not None and identifier in self.definitions._defs[d]:
+            return bool(self._tainted >> d & 1)
+        if identifier in self._source_uses:
+            return True
+        return any(self._tainted >> d & 1 for d in self.definitions._reaching(i, name))
+
+    def is_statement_tainted(self, stat: Statement) -> bool:
+        """
+        Checks if any variable of a statement of the function carries taint.
+
+        Args:
+            stat (Statement): A statement of the function.
+
+        Returns:
+            bool: True if a variable defined or used by the statement is tainted.
+        """
+        return any(self.is_tainted(var) for var in statement_variables(stat))
+
+    @property
+    def findings(self) -> list[Identifier]:
+        """
+        The sink identifiers that receive taint, sorted by position.
+        """
+        if self.sinks is None:
+            return []
+        findings = [
+            var
+            for stat in self.graph.statements
+            for var in statement_variables(stat)
+            if self.sinks(var) and self.is_tainted(var)
+        ]
+        return sorted(findings, key=lambda x: (x.start_line, x.start_column))
@@ -0,0 +1,77 @@
+import gc
+import tempfile
+import unittest
+import weakref
+from pathlib import Path
+
+import scubatrace
+from scubatrace.slots import cached_value
+
+
+class TestAnalysisCache(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent
+        self.samples_dir = self.test_dir / "samples"
+        self.project_path = self.samples_dir / "c"
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+        self.project = scubatrace.Project.create(
+            str(self.project_path),
+            language=scubatrace.language.C,
+            enable_lsp=False,
+            cache_dir=self.cache_dir.name,
+        )
+
+    def test_cache_restore_statements(self):
+        function = self.project.files["main.c"].functions_by_name("main")[0]
+        function.build_cfg()
+        post_controls = {
+            stat.signature: [post.signature for post in stat.post_controls]
+            for stat in function.statements
+        }
+        identifiers = [identifier.signature for identifier in function.identifiers]
+        self.project.save_cache()
+
+        project = scubatrace.Project.create(
+            str(self.project_path),
+            language=scubatrace.language.C,
+            enable_lsp=False,
+            cache_dir=self.cache_dir.name,
+        )
+        function = project.files["main.c"].functions_by_name("main")[0]
+        self.assertIsNotNone(cached_value(function, "statements"))
+        self.assertIsNotNone(cached_value(function, "identifiers"))
+        self.assertEqual(
+            [identifier.signature for identifier in function.identifiers], identifiers
+        )
+        for stat in function.statements:
+            self.assertTrue(hasattr(stat, "_post_controls"))
+        for stat in function.statements:
+            self.assertEqual(
+                [post.signature for post in stat.post_controls],
+                post_controls[stat.signature],
+            )
+
+    def test_cache_changed_file(self):
+        file = self.project.files["main.c"]
+        self.assertGreater(len(file.statements), 0)
+        self.project.save_cache()
+
+        project = scubatrace.Project.create(
+            str(self.project_path),
+            language=scubatrace.language.C,
+            enable_lsp=False,
+            cache_dir=self.cache_dir.name,
+        )
+        changed = scubatrace.File.create(
+            file.abspath, project, file.text.replace("int ", "long ")
+        )
+        cache = project.analysis_cache or self.fail()
+        self.assertNotEqual(cache.digest(changed), cache.digest(file))
+        self.assertIsNone(cache.load_statements(changed))
+
+    def test_cache_project_collected(self):
+        project = weakref.ref(self.project)
+        del self.project
+        gc.collect()
+        self.assertIsNone(project())
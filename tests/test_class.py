@@ -34,6 +34,12 @@ class TestClass(unittest.TestCase):
         field_names = sorted([field.name for field in fields])
         self.assertEqual(field_names, ["brand", "color"])
 
+    def test_class_method_parameters(self):
+        constructor = self.file.functions_by_name("Car")[0]
+        parameters = [param.text for param in constructor.parameters]
+        self.assertEqual(parameters, ["b", "c"])
+        self.assertEqual(constructor.parameter_lines, [11])
+
 
 class TestPythonClass(unittest.TestCase):
     def setUp(self):
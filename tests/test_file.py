@@ -85,3 +85,73 @@ class TestFile(unittest.TestCase):
 
         one_shot_result = self.file.query_oneshot(query_str) or self.fail()
         self.assertIn(one_shot_result.start_line, target_lines)
+
+    def test_file_apply_edit(self):
+        add = self.file.functions_by_name("add")[0]
+        main = self.file.functions_by_name("main")[0]
+        main_statements = main.statements
+        graph = main.control_flow_graph
+        post_controls = main_statements[0].post_controls
+
+        text = self.file.text
+        start = text.index("return a + sub(a, b)")
+        self.file.apply_edit(start + len("return "), start + len("return a"), "b")
+
+        self.assertIn("return b + sub(a, b)", self.file.text)
+        self.assertFalse(any(stat is add for stat in self.file.statements))
+        self.assertIs(self.file.functions_by_name("main")[0], main)
+        self.assertIs(main.statements, main_statements)
+        self.assertIs(main.control_flow_graph, graph)
+        self.assertEqual(main_statements[0].post_controls, post_controls)
+        self.assertEqual(main_statements[0].text, "int a = 1;")
+
+        new_add = self.file.functions_by_name("add")[0]
+        self.assertEqual(
+            new_add.statements[0].text, "return b + sub(a, b) + mul(a, b);"
+        )
+
+    def test_file_update(self):
+        main = self.file.functions_by_name("main")[0]
+        text = self.file.text
+        self.file.update("\n\n" + text)
+
+        self.assertEqual(self.file.text, "\n\n" + text)
+        self.assertIs(self.file.functions_by_name("main")[0], main)
+        self.assertEqual(main.start_line, 13)
+        self.assertEqual(
+            self.file.statements_by_line(18)[0].text, "int c = count + argc;"
+        )
+        self.assertEqual(
+            [stat.text for stat in main.statements[1].pre_controls], ["int a = 1;"]
+        )
+
+    def test_file_line_index(self):
+        for line in range(-1, len(self.file.lines) + 3):
+            expected = None
+            for func in self.file.functions:
+                if func.start_line <= line <= func.end_line:
+                    expected = func
+                    break
+            self.assertIs(self.file.function_by_line(line), expected)
+            for stat in self.file.statements_by_line(line):
+                self.assertTrue(stat.start_line <= line <= stat.end_line)
+        self.assertEqual(self.file.statements_by_line(18)[0].text, "a += 1;")
+        self.assertEqual(
+            self.file.statements_by_line(4)[0].text, "int mul(int a, int b);"
+        )
+
+    def test_file_identifier_by_position(self):
+        for identifier in self.file.identifiers:
+            for column in [identifier.start_column, identifier.end_column]:
+                found = self.file.identifier_by_position(identifier.start_line, column)
+                self.assertIsNotNone(found)
+                assert found is not None
+                self.assertEqual(found.start_line, identifier.start_line)
+                self.assertTrue(found.start_column <= column <= found.end_column)
+                stat_found = identifier.statement.identifier_by_position(
+                    identifier.start_line, column
+                )
+                self.assertIsNotNone(stat_found)
+        argc = self.file.identifier_by_position(16, 21) or self.fail()
+        self.assertEqual(argc.text, "argc")
+        self.assertIsNone(self.file.identifier_by_position(16, 1))
@@ -2,6 +2,7 @@ import unittest
 from pathlib import Path
 
 import scubatrace
+from scubatrace.go.function import GoFunction
 
 
 class TestFunction(unittest.TestCase):
@@ -68,6 +69,86 @@ class TestFunction(unittest.TestCase):
         self.assertEqual(stats[0].start_line, 11)
         self.assertEqual(stats[len(stats) - 1].start_line, second=40)
 
+    def test_function_slice_many(self):
+        criteria = [self.file.statements_by_line(line) for line in (16, 35, 40)]
+        slices = self.function.slice_many(criteria)
+        self.assertEqual(len(slices), 3)
+        self.assertEqual(slices[0], self.function.slice_by_lines([16]))
+        for criterion, sliced in zip(criteria, slices):
+            for stat in criterion:
+                self.assertIn(stat, sliced)
+            for stat in sliced:
+                self.assertIn(stat, self.function.program_dependence_graph)
+
+    def test_function_reaching_definitions(self):
+        definitions = self.function.reaching_definitions
+        use = self.file.identifier_by_position(17, 12) or self.fail()
+        self.assertEqual(
+            [(d.start_line, d.start_column) for d in definitions.definitions(use)],
+            [(13, 9), (35, 9)],
+        )
+        definition = self.file.identifier_by_position(35, 9) or self.fail()
+        self.assertEqual(
+            [u.start_line for u in definitions.uses(definition)],
+            [17, 37, 38, 42, 47],
+        )
+        self.assertEqual(use.pre_data_dependents, definitions.definitions(use))
+
+    def test_function_dominator_tree(self):
+        loop = self.file.statements_by_line(17)[0]
+        body = self.file.statements_by_line(18)[0]
+        after = self.file.statements_by_line(40)[0]
+        dominators = self.function.dominator_tree
+        self.assertEqual(dominators.immediate_dominator(body), loop)
+        self.assertTrue(dominators.dominates(self.function, after))
+        self.assertFalse(dominators.dominates(body, after))
+        post_dominators = self.function.post_dominator_tree
+        self.assertEqual(post_dominators.immediate_dominator(loop), after)
+        self.assertTrue(post_dominators.dominates(after, body))
+
+    def test_function_control_dependence_graph(self):
+        cdg = self.function.control_dependence_graph
+        loop = self.file.statements_by_line(17)[0]
+        self.assertEqual([s.start_line for s in cdg.dependents(loop)], [18, 19, 26])
+        self.assertEqual([s.start_line for s in cdg.controllers(loop)], [11])
+        after = self.file.statements_by_line(40)[0]
+        self.assertEqual(after.pre_control_dependents, [self.function])
+
+    def test_function_control_dependence_loops(self):
+        def dependents(stat):
+            return [s.start_line for s in stat.post_control_dependents]
+
+        for name, ends in (("test_continue", []), ("test_break", [109])):
+            function = self.file.functions_by_name(name)[0]
+            loop = function.statements[0]
+            assert isinstance(loop, scubatrace.BlockStatement)
+            branch = loop.statements[0]
+            self.assertEqual(dependents(function), [loop.start_line, *ends])
+            self.assertEqual(dependents(loop), [branch.start_line])
+            self.assertEqual(
+                dependents(branch), [branch.start_line + 1, branch.start_line + 3]
+            )
+
+    def test_function_taint_analysis(self):
+        c = self.file.identifier_by_position(16, 9) or self.fail()
+        a = self.file.identifier_by_position(13, 9) or self.fail()
+        self.assertTrue(c.is_taint_from_entry)
+        self.assertFalse(a.is_taint_from_entry)
+        self.assertTrue(self.file.statements_by_line(47)[0].is_taint_from_entry)
+
+        def sinks(var):
+            return var.statement.start_line == 38 and not var.is_left_value
+
+        taint = scubatrace.TaintAnalysis(self.function, sinks=sinks)
+        self.assertEqual([var.text for var in taint.findings], ["c"])
+        taint = scubatrace.TaintAnalysis(
+            self.function,
+            sanitizers=lambda stat: stat.start_line == 16,
+            sinks=sinks,
+        )
+        self.assertFalse(taint.is_tainted(c))
+        self.assertEqual(taint.findings, [])
+
     def test_function_walk_backward(self):
         function = self.file.functions_by_name("add")[0]
         functions = list(function.walk_backward())
@@ -92,3 +173,55 @@ class TestFunction(unittest.TestCase):
         self.assertIsNotNone(callgraph)
         self.assertGreater(len(callgraph.nodes), 0)
         self.assertGreater(len(callgraph.edges), 0)
+
+
+class TestPythonFunction(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent
+        self.samples_dir = self.test_dir / "samples"
+        self.project_path = self.samples_dir / "python"
+        self.project = scubatrace.Project.create(
+            str(self.project_path), language=scubatrace.language.PYTHON
+        )
+        self.file = self.project.files.get("test.py") or self.fail()
+        self.function = self.file.functions_by_name("main")[0]
+        self.callee = self.file.functions_by_name("add")[0]
+
+    def test_function_summary(self):
+        summary = self.callee.summary
+        self.assertEqual(summary.parameter_returns, [True, True])
+        self.assertEqual([s.start_line for s in summary.return_slice], [4, 5])
+        self.assertEqual([s.start_line for s in summary.parameter_slices[1]], [5])
+
+    def test_function_slice_interprocedural(self):
+        criteria = self.file.statements_by_line(12)
+        stats = self.function.slice_interprocedural(criteria)
+        self.assertEqual([s.start_line for s in stats], [4, 5, 8, 9, 10, 11, 12])
+        stats = self.function.slice_interprocedural(criteria, call_depth=0)
+        self.assertNotIn(5, [s.start_line for s in stats])
+        criteria = self.file.statements_by_line(5)
+        stats = self.callee.slice_interprocedural(criteria, direction="forward")
+        self.assertEqual([s.start_line for s in stats], [5, 11, 12])
+
+
+class TestGoFunction(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent
+        self.samples_dir = self.test_dir / "samples"
+        self.project_path = self.samples_dir / "go"
+        self.project = scubatrace.Project.create(
+            str(self.project_path), language=scubatrace.language.GO, enable_lsp=False
+        )
+        self.file = self.project.files.get("main.go") or self.fail()
+        self.function = self.file.functions_by_name("main")[0]
+
+    def test_function_control_dependence_defer(self):
+        assert isinstance(self.function, GoFunction)
+        first = self.function.first_statement or self.fail()
+        self.assertEqual(self.function.post_controls[:1], [first])
+        self.assertEqual(
+            [s.start_line for s in self.function.post_control_dependents],
+            [s.start_line for s in self.function.statements],
+        )
+        defer = self.function.defer_statements[0]
+        self.assertEqual(defer.pre_control_dependents, [self.function])
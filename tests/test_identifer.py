@@ -22,6 +22,18 @@ class TestIdentifier(unittest.TestCase):
         identifier = scubatrace.Identifier(self.identifier.node, self.statement)
         self.assertIsNotNone(identifier)
 
+    def test_identifier_slots(self):
+        self.assertFalse(hasattr(self.identifier, "__dict__"))
+        self.assertTrue(self.identifier.is_left_value)
+        self.assertTrue(
+            type(self.identifier).is_left_value.is_cached(self.identifier)  # type: ignore
+        )
+        del self.identifier.is_left_value
+        self.assertFalse(
+            type(self.identifier).is_left_value.is_cached(self.identifier)  # type: ignore
+        )
+        self.assertTrue(self.identifier.is_left_value)
+
     def test_identifier_post_data_dependents(self):
         dependents = self.identifier.post_data_dependents
         self.assertEqual(len(dependents), 5)
@@ -56,3 +68,19 @@ class TestIdentifier(unittest.TestCase):
         self.assertEqual(param.name, "argc")
         self.assertEqual(len(param.post_data_dependents), 1)
         self.assertEqual(param.post_data_dependents[0].start_line, 16)
+
+    def test_identifier_value_kinds(self):
+        statement = self.file.statements_by_line(38)[-1]
+        kinds = {
+            identifier.text: (identifier.is_left_value, identifier.is_argument)
+            for identifier in statement.identifiers
+        }
+        self.assertEqual(
+            kinds,
+            {
+                "b": (True, False),
+                "sub": (False, False),
+                "a": (False, True),
+                "c": (False, True),
+            },
+        )
@@ -0,0 +1,39 @@
+import unittest
+
+import scubatrace
+from scubatrace.parser import QueryCache
+
+
+class TestParser(unittest.TestCase):
+    def setUp(self):
+        self.parser = scubatrace.Parser(scubatrace.language.C.tslanguage)
+        self.code = "int main() { int a = 1; a = a + 1; return a; }"
+
+    def test_parser_query(self):
+        nodes = self.parser.query_all(self.code, "(identifier)@name")
+        self.assertEqual([n.text for n in nodes], [b"main", b"a", b"a", b"a", b"a"])
+
+    def test_parser_query_cache_shared_by_language(self):
+        other = scubatrace.Parser(scubatrace.language.C.tslanguage)
+        self.assertIs(self.parser.query_cache, other.query_cache)
+
+    def test_parser_query_cache_hits(self):
+        cache = self.parser.query_cache
+        query_str = "(return_statement)@ret"
+        self.parser.query_all(self.code, query_str)
+        hits, misses = cache.hits, cache.misses
+        self.parser.query_all(self.code, query_str)
+        self.assertEqual(cache.hits, hits + 1)
+        self.assertEqual(cache.misses, misses)
+
+    def test_query_cache_bound(self):
+        cache = QueryCache(scubatrace.language.C.tslanguage, maxsize=2)
+        first = cache.get("(identifier)@a")
+        cache.get("(identifier)@b")
+        cache.get("(identifier)@c")
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.misses, 3)
+        self.assertIsNot(cache.get("(identifier)@a"), first)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.hits, 0)
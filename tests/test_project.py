@@ -1,4 +1,6 @@
+import asyncio
 import os
+import tempfile
 import unittest
 from pathlib import Path
 
@@ -42,6 +44,204 @@ class TestProject(unittest.TestCase):
         self.assertGreater(len(callgraph.nodes), 0)
         self.assertGreater(len(callgraph.edges), 0)
 
+    def test_project_full_callgraph(self):
+        py_project = scubatrace.Project.create(
+            str(self.samples_dir / "python"), language=scubatrace.language.PYTHON
+        )
+        callgraph = py_project.full_callgraph(workers=4)
+        self.assertGreaterEqual(len(callgraph), len(py_project.functions))
+        main = py_project.files["test.py"].functions_by_name("main")[0]
+        add = py_project.files["test.py"].functions_by_name("add")[0]
+        self.assertEqual(callgraph.callees_of(main), [add])
+        self.assertEqual(callgraph.callers_of(add), [main])
+        graph = callgraph.to_networkx()
+        self.assertEqual(graph.number_of_edges(), len(callgraph.calls.targets))
+        self.assertEqual(graph.get_edge_data(main, add)[0]["line"], 11)
+
+    def test_project_lsp_pool(self):
+        py_project = scubatrace.Project.create(
+            str(self.samples_dir / "python"),
+            language=scubatrace.language.PYTHON,
+            lsp_servers=2,
+        )
+        self.assertEqual(len(py_project.lsp_pool), 2)
+        self.assertIs(py_project.lsp, py_project.lsp_pool[0])
+        test_file = py_project.files["test.py"]
+        self.assertIs(test_file.lsp, py_project.lsp_for(test_file))
+        self.assertIs(py_project.lsp_for(test_file), py_project.lsp_for(test_file))
+        callgraph = py_project.full_callgraph(workers=2)
+        main = test_file.functions_by_name("main")[0]
+        add = test_file.functions_by_name("add")[0]
+        self.assertEqual(callgraph.callees_of(main), [add])
+
+    def test_project_lsp_cache(self):
+        py_project = scubatrace.Project.create(
+            str(self.samples_dir / "python"), language=scubatrace.language.PYTHON
+        )
+        test_file = py_project.files["test.py"]
+        parameter = test_file.functions_by_name("add")[0].parameters[0]
+        references = parameter.references
+        lsp_cache = py_project.lsp_cache
+        misses = lsp_cache.misses
+        self.assertEqual(parameter.references, references)
+        self.assertEqual(lsp_cache.misses, misses)
+        self.assertGreater(lsp_cache.hits, 0)
+        test_file.apply_edit(0, 0, "\n")
+        self.assertEqual(len(lsp_cache), 0)
+
+    def test_project_lsp_open_files(self):
+        py_project = scubatrace.Project.create(
+            str(self.samples_dir / "python"), language=scubatrace.language.PYTHON
+        )
+        open_files = py_project.lsp_open_files[0]
+        open_files.max_open = 1
+        car, test = py_project.files["car.py"], py_project.files["test.py"]
+        self.assertIs(car.lsp, py_project.lsp)
+        self.assertIn("car.py", open_files)
+        self.assertIs(test.lsp, py_project.lsp)
+        self.assertEqual(len(open_files), 1)
+        self.assertIn("test.py", open_files)
+        callees = test.functions_by_name("main")[0].callees
+        self.assertEqual([callee.name for callee in callees], ["add"])
+        test.apply_edit(0, 0, "\n")
+        self.assertIs(car.lsp, py_project.lsp)
+        self.assertIn("test.py", open_files)
+        self.assertIn("car.py", open_files)
+        start = test.text.index("add")
+        test.apply_edit(start, start + len("add"), "plus")
+        self.assertEqual(py_project.lsp.get_open_file_text("test.py"), test.text)
+
+    def test_project_lsp_background(self):
+        py_project = scubatrace.Project.create(
+            str(self.samples_dir / "python"),
+            language=scubatrace.language.PYTHON,
+            lsp_background=True,
+        )
+        py_project.preload()
+        py_project.lsp_ready.result(timeout=120)
+        add = py_project.files["test.py"].functions_by_name("add")[0]
+        self.assertGreater(len(add.references), 0)
+
+        readiness = py_project.lsp_readiness[0]
+        values = []
+        readiness.on_progress = values.append
+        server = readiness.lsp.language_server.server
+        notified = []
+
+        async def notify(params):
+            notified.append(params)
+
+        server.on_notification("$/progress", notify)
+        on_progress = server.on_notification_handlers["$/progress"]
+        begin = {"kind": "begin", "title": "Indexing"}
+        asyncio.run(on_progress({"token": 1, "value": begin}))
+        self.assertEqual(readiness.progress[1]["title"], "Indexing")
+        self.assertEqual(values, [{"token": 1, **begin}])
+        self.assertEqual(notified, [{"token": 1, "value": begin}])
+        asyncio.run(on_progress({"token": 1, "value": {"kind": "end"}}))
+        self.assertNotIn(1, readiness.progress)
+
+    def test_project_lsp_readiness(self):
+        py_project = scubatrace.Project.create(
+            str(self.samples_dir / "python"), language=scubatrace.language.PYTHON
+        )
+        self.assertTrue(py_project.lsp_readiness[0].started.done())
+
+        # a server offered window.workDoneProgress is not ready before its first work
+        readiness = scubatrace.LSPReadiness(py_project.lsp, grace=60)
+        readiness._started = readiness._awaiting_begin = True
+        readiness._resolve()
+        self.assertFalse(readiness.future.done())
+        server = py_project.lsp.language_server.server
+        on_progress = server.on_notification_handlers["$/progress"]
+        asyncio.run(on_progress({"token": 1, "value": {"kind": "begin"}}))
+        self.assertFalse(readiness.future.done())
+        asyncio.run(on_progress({"token": 1, "value": {"kind": "end"}}))
+        self.assertTrue(readiness.future.done())
+
+    def test_project_symbol_index(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            py_project = scubatrace.Project.create(
+                str(self.samples_dir / "python"),
+                language=scubatrace.language.PYTHON,
+                enable_lsp=False,
+                cache_dir=cache_dir,
+            )
+            index = scubatrace.SymbolIndex(py_project, workers=2)
+            [start_engine] = index.lookup("Car.start_engine")
+            self.assertEqual(index.lookup("start_engine"), [start_engine])
+            self.assertEqual(
+                (start_engine.kind, start_engine.file), ("function", "car.py")
+            )
+            entity = index.entity(start_engine) or self.fail()
+            self.assertEqual(entity.name, "start_engine")
+            self.assertEqual(
+                [s.qualified_name for s in index.prefix("Car.", kind="field")],
+                ["Car.a", "Car.b"],
+            )
+            self.assertIn(start_engine, index.fuzzy("strat_engine"))
+            py_project.save_cache()
+
+            cached_project = scubatrace.Project.create(
+                str(self.samples_dir / "python"),
+                language=scubatrace.language.PYTHON,
+                enable_lsp=False,
+                cache_dir=cache_dir,
+            )
+            car = cached_project.files["car.py"]
+            cache = cached_project.analysis_cache or self.fail()
+            self.assertIsNotNone(cache.get_symbols(car))
+            index = cached_project.symbol_index
+            self.assertEqual(index.lookup("Car.start_engine"), [start_engine])
+            self.assertNotIn("tree", car.__dict__)
+
+            start = car.text.index("start_engine")
+            car.apply_edit(start, start + len("start_engine"), "run_engine")
+            self.assertEqual(index.lookup("start_engine"), [])
+            self.assertEqual(len(index.lookup("Car.run_engine", kind="function")), 1)
+
+    def test_project_symbol_index_edited(self):
+        c_project = scubatrace.Project.create(
+            str(self.samples_dir / "c"),
+            language=scubatrace.language.C,
+            enable_lsp=False,
+        )
+        main = c_project.files["main.c"]
+        main.update(main.text.replace("void test_continue(", "void renamed_continue("))
+        self.assertTrue(main.is_modified)
+        self.assertNotIn("tree", main.__dict__)
+        index = scubatrace.SymbolIndex(c_project, workers=2)
+        self.assertEqual(index.lookup("test_continue"), [])
+        self.assertEqual(len(index.lookup("renamed_continue")), 1)
+        self.assertFalse(c_project.files["sub.c"].is_modified)
+
+    def test_project_name_resolver(self):
+        resolver = self.project.name_resolver
+        main = self.project.files["main.c"].functions_by_name("main")[0]
+        add = self.project.files["main.c"].functions_by_name("add")[0]
+        calls = resolver.calls(main)
+        self.assertEqual(
+            [(call.callee.name, call.call_site.start_line) for call in calls],
+            [("add", 17), ("sub", 38), ("add", 42), ("printf", 47)],
+        )
+        self.assertEqual(calls[0].confidence, 1.0)
+        self.assertIsInstance(calls[-1].callee, scubatrace.DummyFunction)
+        self.assertEqual(calls[-1].confidence, 0.0)
+        callers = [call.caller.name for call in resolver.callers(add)]
+        self.assertIn("main", callers)
+
+    def test_project_files_by_name(self):
+        c_project = scubatrace.Project.create(
+            str(self.samples_dir / "c"),
+            language=scubatrace.language.C,
+            enable_lsp=False,
+        )
+        self.assertEqual(
+            [file.relpath for file in c_project.files_by_name["sub.h"]],
+            [os.path.join("include", "sub.h")],
+        )
+        self.assertNotIn("include", c_project.files_by_name)
+
     def test_files_keys_are_relative(self):
         c_project = scubatrace.Project.create(
             str(self.samples_dir / "c") + os.sep,
@@ -54,6 +254,18 @@ class TestProject(unittest.TestCase):
                 f"Expected relative path key, got absolute path: {key}",
             )
 
+    def test_project_preload(self):
+        c_project = scubatrace.Project.create(
+            str(self.samples_dir / "c"),
+            language=scubatrace.language.C,
+            enable_lsp=False,
+        )
+        c_project.preload(workers=2)
+        for file in c_project.files.values():
+            self.assertIsNotNone(file._content)
+            self.assertIn("statements", file.__dict__)
+        self.assertGreater(len(c_project.functions), 0)
+
 
 class TestGitProject(unittest.TestCase):
     def setUp(self):
@@ -64,6 +64,58 @@ class TestStatement(unittest.TestCase):
         is_taint_from_entry = self.statement.is_taint_from_entry
         self.assertIsInstance(is_taint_from_entry, bool)
 
+    def test_statement_key(self):
+        file = scubatrace.File.create(str(self.project_path / "main.c"), self.project)
+        statement = file.statements_by_line(14)[0]
+        self.assertIsNot(statement, self.statement)
+        self.assertEqual(statement, self.statement)
+        self.assertEqual(hash(statement), hash(self.statement))
+        self.assertEqual(statement.signature, self.statement.signature)
+        self.assertNotEqual(self.statement, self.statement.next_sibling)
+        identifier = statement.identifiers[0]
+        self.assertIn(identifier, set(self.statement.identifiers))
+        self.assertIs(statement.key, statement.key)
+        self.assertEqual(statement.key[0], self.file.file_id)
+
+        # the same code in another file is another statement
+        copy = scubatrace.File.create(
+            str(self.project_path / "copy.c"), self.project, self.file.text
+        )
+        other = copy.statements_by_line(14)[0]
+        self.assertEqual(other.node.start_byte, statement.node.start_byte)
+        self.assertNotEqual(other, statement)
+        self.assertNotEqual(other.identifiers[0], identifier)
+
+    def test_statement_slots(self):
+        statement = self.statement
+        identifiers = statement.identifiers
+        cached = [
+            statement.variables,
+            statement.left_values,
+            statement.post_controls,
+            statement.next_sibling,
+        ]
+        self.assertEqual(len(cached), 4)
+        self.assertEqual(statement.__dict__, {})
+        self.assertIs(statement.identifiers, identifiers)
+        del statement.identifiers
+        self.assertIsNot(statement.identifiers, identifiers)
+        self.assertEqual(statement.identifiers, identifiers)
+
+    def test_statement_query(self):
+        loop = self.function.statements_by_type("while_statement")[0]
+        assert isinstance(loop, scubatrace.BlockStatement)
+        calls = loop.query(self.file.language.query_call)
+        self.assertIs(calls[0], loop)
+        self.assertEqual([stat.text for stat in calls[1:]], ["b = sub(a, c);"])
+
+        calls = self.function.query(self.file.language.query_call)
+        self.assertIn(loop, calls)
+        for stat in calls:
+            self.assertIs(stat.function, self.function)
+        file_calls = self.file.query(self.file.language.query_call)
+        self.assertTrue(set(calls) <= set(file_calls))
+
 
 class TestPythonStatement(unittest.TestCase):
     def setUp(self):